@@ -5,25 +5,384 @@
 # FILE: scoreboard/admin.py
 # ============================================
 
-from django.contrib import admin
-from .models import Member, ScoreEntry, Score
+from django.contrib import admin, messages
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.forms import ModelForm
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.functional import cached_property
+from django.utils.html import format_html, format_html_join
+from .cache import deferred_data_version
+from .models import (
+    League, Member, ScoreEntry, Score, HeadToHead, StandingsSnapshot,
+    Season, SeasonSummary, ArchivedScore, RequestProfile,
+)
+from .seasons import close_season
+from .stats import entries_changed, members_first_games
+
+@admin.register(League)
+class LeagueAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug', 'created_at')
+    search_fields = ('name',)
+    prepopulated_fields = {'slug': ('name',)}
+    filter_horizontal = ('users',)
+
+    # The cascade deletes the league's members and entries one by one; their
+    # per-row bumps would update the rows being deleted
+    def delete_model(self, request, obj):
+        with deferred_data_version():
+            super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        with deferred_data_version():
+            super().delete_queryset(request, queryset)
 
 @admin.register(Member)
 class MemberAdmin(admin.ModelAdmin):
-    list_display = ('name', 'created_at')
+    list_display = ('name', 'league', 'created_at')
+    list_filter = ('league',)
     search_fields = ('name',)
 
+    # Deleting a member deletes their scores, which changes the positions in
+    # every game they were listed in
+    def delete_model(self, request, obj):
+        since = members_first_games([obj])
+        with deferred_data_version():
+            super().delete_model(request, obj)
+            _resync_leagues(since)
+
+    def delete_queryset(self, request, queryset):
+        since = members_first_games(queryset)
+        with deferred_data_version():
+            super().delete_queryset(request, queryset)
+            _resync_leagues(since)
+
+def _earliest_dates(rows):
+    """{league_id: earliest date} for (league_id, date) rows, read before a bulk delete."""
+    since = {}
+    for league_id, date in rows:
+        since[league_id] = min(date, since.get(league_id, date))
+    return since
+
+def _resync_leagues(since):
+    for league in League.objects.filter(pk__in=since):
+        entries_changed(league, since[league.pk])
+
+class ApproximateCountPaginator(Paginator):
+    """
+    Uses the planner's row estimate instead of COUNT(*) for unfiltered
+    changelists of large PostgreSQL tables; exact count otherwise.
+    """
+    estimate_threshold = 100000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] >= self.estimate_threshold:
+                return row[0]
+        return super().count
+
+class ScoreInlineForm(ModelForm):
+    def clean(self):
+        cleaned_data = super().clean()
+        # Zero (did not play) rows are hidden from the inline; entering a
+        # score for such a member updates the hidden row instead of clashing with it
+        member = cleaned_data.get('member')
+        if self.instance._state.adding and self.instance.entry_id and member:
+            hidden_pk = (
+                Score.objects.filter(entry_id=self.instance.entry_id, member=member, score=0)
+                .values_list('pk', flat=True).first()
+            )
+            if hidden_pk is not None:
+                self.instance.pk = hidden_pk
+                self.instance._state.adding = False
+        return cleaned_data
+
 class ScoreInline(admin.TabularInline):
     model = Score
+    form = ScoreInlineForm
     extra = 0
+    exclude = ('league',)
+    autocomplete_fields = ('member',)
+    verbose_name_plural = "Scores (members who played)"
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).exclude(score=0).select_related('member')
+
+    # Members of the game's league only (Score.clean checks new games too)
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        if obj is not None:
+            formset.form.base_fields['member'].queryset = Member.objects.filter(league_id=obj.league_id)
+        return formset
+
+class ArchivedScoreInline(admin.TabularInline):
+    model = ArchivedScore
+    fields = ('member', 'score')
+    readonly_fields = ('member', 'score')
+    can_delete = False
+    extra = 0
+    verbose_name_plural = "Scores (archived with the season)"
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).exclude(score=0).select_related('member')
 
 @admin.register(ScoreEntry)
 class ScoreEntryAdmin(admin.ModelAdmin):
-    list_display = ('date', 'created_by', 'created_at')
-    list_filter = ('date', 'created_by')
+    list_display = ('date', 'league', 'season', 'created_by', 'created_at')
+    list_filter = ('league', 'season', 'created_by')
+    list_select_related = ('league', 'season', 'created_by')
+    date_hierarchy = 'date'
+    search_fields = ('date',)
     inlines = [ScoreInline]
 
+    # Games of closed seasons are read-only: their totals live in SeasonSummary
+    def get_inlines(self, request, obj):
+        if obj is not None and obj.season_id:
+            return [ArchivedScoreInline]
+        return super().get_inlines(request, obj)
+
+    def has_change_permission(self, request, obj=None):
+        if obj is not None and obj.season_id:
+            return False
+        return super().has_change_permission(request, obj)
+
+    def has_delete_permission(self, request, obj=None):
+        if obj is not None and obj.season_id:
+            return False
+        return super().has_delete_permission(request, obj)
+
+    def save_formset(self, request, form, formset, change):
+        # Scores carry their entry's league
+        for score in formset.save(commit=False):
+            score.league_id = form.instance.league_id
+            score.save()
+        for score in formset.deleted_objects:
+            score.delete()
+        formset.save_m2m()
+
+    # Edits and deletes here can change any pair and every later standing;
+    # the entry's own save and the resync bump the data version once
+    def changeform_view(self, request, *args, **kwargs):
+        with deferred_data_version():
+            return super().changeform_view(request, *args, **kwargs)
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        dates = [form.instance.date]
+        if change and 'date' in form.initial:
+            dates.append(form.initial['date'])
+        entries_changed(form.instance.league, min(dates))
+
+    def delete_model(self, request, obj):
+        with deferred_data_version():
+            super().delete_model(request, obj)
+            entries_changed(obj.league, obj.date)
+
+    def delete_queryset(self, request, queryset):
+        since = _earliest_dates(queryset.values_list('league_id', 'date'))
+        with deferred_data_version():
+            super().delete_queryset(request, queryset)
+            _resync_leagues(since)
+
 @admin.register(Score)
 class ScoreAdmin(admin.ModelAdmin):
     list_display = ('member', 'score', 'entry')
-    list_filter = ('entry__date',)
+    list_filter = ('league',)
+    list_select_related = ('member', 'entry')
+    date_hierarchy = 'entry__date'
+    autocomplete_fields = ('member', 'entry')
+    exclude = ('league',)
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+    # A score stays in its league: members and games of other leagues are
+    # not offered when editing (Score.clean checks new scores)
+    def get_form(self, request, obj=None, **kwargs):
+        form = super().get_form(request, obj, **kwargs)
+        if obj is not None:
+            form.base_fields['member'].queryset = Member.objects.filter(league_id=obj.league_id)
+            form.base_fields['entry'].queryset = ScoreEntry.objects.filter(league_id=obj.league_id)
+        return form
+
+    # Moving a score to another game changes both games
+    def save_model(self, request, obj, form, change):
+        dates = [(obj.entry.league_id, obj.entry.date)]
+        if change and 'entry' in form.changed_data:
+            dates += ScoreEntry.objects.filter(pk=form.initial['entry']).values_list('league_id', 'date')
+        obj.league_id = obj.entry.league_id
+        super().save_model(request, obj, form, change)
+        _resync_leagues(_earliest_dates(dates))
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        entries_changed(obj.league, obj.entry.date)
+
+    def delete_queryset(self, request, queryset):
+        since = _earliest_dates(queryset.values_list('league_id', 'entry__date'))
+        super().delete_queryset(request, queryset)
+        _resync_leagues(since)
+
+@admin.register(HeadToHead)
+class HeadToHeadAdmin(admin.ModelAdmin):
+    list_display = ('member', 'opponent', 'wins', 'losses', 'draws', 'games')
+    list_filter = ('league',)
+    list_select_related = ('member', 'opponent')
+    search_fields = ('member__name', 'opponent__name')
+
+@admin.register(StandingsSnapshot)
+class StandingsSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('date', 'league', 'entry_count', 'created_at')
+    list_filter = ('league',)
+    exclude = ('standings',)
+
+class SeasonSummaryInline(admin.TabularInline):
+    model = SeasonSummary
+    fields = ('member', 'total_score', 'games', 'rank_points', 'max_points', 'first', 'second', 'third', 'fourth', 'fifth', 'lost')
+    readonly_fields = fields
+    can_delete = False
+    extra = 0
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('member').order_by('-total_score')
+
+@admin.register(Season)
+class SeasonAdmin(admin.ModelAdmin):
+    list_display = ('name', 'league', 'start_date', 'end_date', 'entry_count', 'closed_at')
+    list_filter = ('league',)
+    list_select_related = ('league',)
+    inlines = [SeasonSummaryInline]
+    actions = ['close_seasons']
+
+    def get_readonly_fields(self, request, obj=None):
+        if obj is not None and obj.is_closed:
+            return ('league', 'name', 'start_date', 'end_date')
+        return ()
+
+    def has_delete_permission(self, request, obj=None):
+        if obj is not None and obj.is_closed:
+            return False
+        return super().has_delete_permission(request, obj)
+
+    @admin.action(description="Close selected seasons (archive their games)")
+    def close_seasons(self, request, queryset):
+        for season in queryset.filter(closed_at__isnull=True).order_by('league', 'end_date'):
+            try:
+                close_season(season)
+            except ValidationError as e:
+                self.message_user(request, "; ".join(e.messages), messages.ERROR)
+            else:
+                self.message_user(request, f"{season}: {season.entry_count} games archived.", messages.SUCCESS)
+
+@admin.register(ArchivedScore)
+class ArchivedScoreAdmin(admin.ModelAdmin):
+    list_display = ('member', 'score', 'entry')
+    list_filter = ('league',)
+    list_select_related = ('member', 'entry')
+    date_hierarchy = 'entry__date'
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'method', 'path', 'status_code', 'mode', 'duration_ms', 'sql_count', 'sql_ms', 'user')
+    list_filter = ('mode', 'method', 'status_code')
+    list_select_related = ('user',)
+    search_fields = ('path',)
+    fields = (
+        'created_at', 'user', 'method', 'path', 'status_code', 'mode',
+        'duration_ms', 'sql_count', 'sql_ms', 'downloads', 'report', 'slowest_queries',
+    )
+    readonly_fields = fields
+
+    # Profiles are only written by RequestProfilingMiddleware
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        # The profile data can be large; the changelist needs none of it
+        queryset = super().get_queryset(request)
+        if request.resolver_match and request.resolver_match.url_name.endswith('_changelist'):
+            queryset = queryset.defer('queries', 'stats', 'stacks', 'profile_data')
+        return queryset
+
+    def get_urls(self):
+        return [
+            path(
+                '<int:pk>/download/<str:kind>/',
+                self.admin_site.admin_view(self.download_view),
+                name='scoreboard_requestprofile_download',
+            ),
+        ] + super().get_urls()
+
+    def download_view(self, request, pk, kind):
+        if not self.has_view_permission(request):
+            raise Http404
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        if kind == 'stacks' and profile.stacks:
+            response = HttpResponse(profile.stacks, content_type='text/plain; charset=utf-8')
+            filename = f"profile-{pk}.folded"
+        elif kind == 'prof' and profile.profile_data:
+            response = HttpResponse(bytes(profile.profile_data), content_type='application/octet-stream')
+            filename = f"profile-{pk}.prof"
+        else:
+            raise Http404
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @admin.display(description="Flamegraph data")
+    def downloads(self, obj):
+        if obj.stacks:
+            return format_html(
+                '<a href="{}">Collapsed stacks</a> (flamegraph.pl, speedscope.app)',
+                reverse('admin:scoreboard_requestprofile_download', args=[obj.pk, 'stacks']),
+            )
+        if obj.profile_data:
+            return format_html(
+                '<a href="{}">.prof file</a> (snakeviz, flameprof)',
+                reverse('admin:scoreboard_requestprofile_download', args=[obj.pk, 'prof']),
+            )
+        return "-"
+
+    @admin.display(description="Report")
+    def report(self, obj):
+        return format_html('<pre style="white-space: pre; overflow-x: auto;">{}</pre>', obj.stats)
+
+    @admin.display(description="Queries (slowest first)")
+    def slowest_queries(self, obj):
+        queries = sorted(obj.queries, key=lambda q: -q['ms'])
+        return format_html(
+            '<table>{}</table>',
+            format_html_join('', '<tr><td>{}</td><td>{} ms</td><td><code>{}</code></td></tr>', (
+                (q['alias'], q['ms'], q['sql']) for q in queries
+            )),
+        )
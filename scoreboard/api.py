@@ -0,0 +1,132 @@
+# ============================================
+# FILE: scoreboard/api.py
+# ============================================
+
+from django.core.exceptions import ValidationError
+from django.http import HttpResponse
+from django.views.decorators.http import condition
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework_simplejwt import serializers as jwt_serializers
+
+from .entries import create_entries, recent_members, search_members, validate_games
+from .cache import league_last_modified, overall_image_etag
+from .leagues import get_current_league
+from .models import HeadToHead, Member
+
+MEMBER_SEARCH_LIMIT = 20
+
+
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    """
+    Adds the claims API views need (username, is_staff, is_superuser) to
+    the token, so JWTStatelessUserAuthentication can build request.user
+    without a query. Refreshed access tokens copy them; staff changes apply
+    on the next login.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token['username'] = user.get_username()
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+        return token
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def head_to_head_api(request):
+    league = get_current_league(request)
+    members = Member.objects.filter(league=league).values('id', 'name')
+    pairs = HeadToHead.objects.filter(league=league, games__gt=0).values(
+        'member_id', 'opponent_id', 'wins', 'losses', 'draws', 'games'
+    )
+    return Response({
+        "league": league.slug,
+        "members": list(members),
+        "pairs": list(pairs),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def member_search_api(request):
+    """
+    Members of the current league whose name starts with ?q=, ignoring case
+    (see entries.search_members). Without q, the recently played shortlist
+    instead.
+    """
+    league = get_current_league(request)
+    query = (request.GET.get('q') or '').strip()
+    if query:
+        members = list(search_members(league, query).values('id', 'name')[:MEMBER_SEARCH_LIMIT])
+    else:
+        members = [{"id": m.id, "name": m.name} for m in recent_members(league)]
+    return Response({"league": league.slug, "members": members})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def standings_image_api(request):
+    """
+    The overall scoreboard image, inline, for bots posting standings to chat:
+    ?size=full|medium|small (small suits embeds), ?format=png|webp|jpeg, ?as_of=YYYY-MM-DD.
+    """
+    from . import images
+
+    # Validated before the conditional GET handling, which would tag (and
+    # could 304) an error response
+    try:
+        as_of, size, image_format = images.overall_image_options(request.GET)
+    except ValueError as e:
+        return Response({"errors": [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+    return _standings_image(request, as_of, size, image_format)
+
+
+@condition(etag_func=overall_image_etag, last_modified_func=league_last_modified)
+def _standings_image(request, as_of, size, image_format):
+    from . import images
+
+    response = HttpResponse(
+        images.overall_scoreboard_image(get_current_league(request), as_of, size, image_format),
+        content_type=images.IMAGE_FORMATS[image_format][1],
+    )
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def score_entry_batch_api(request):
+    """
+    Records several games at once:
+    {"games": [{"date": "2025-01-10", "scores": [{"member": "Alice", "score": 120}, ...]}, ...]}
+    Members are given by name ("member") or id ("member_id").
+    """
+    league = get_current_league(request)
+    games = request.data.get('games') if isinstance(request.data, dict) else None
+    if not isinstance(games, list) or not all(isinstance(game, dict) for game in games):
+        return Response({"errors": ["Expected a JSON object with a 'games' list of objects."]}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        games = validate_games(league, [
+            {
+                "date": game.get('date'),
+                "scores": [
+                    (row.get('member_id', row.get('member')), row.get('score'))
+                    for row in game.get('scores') or [] if isinstance(row, dict)
+                ],
+            }
+            for game in games
+        ])
+    except ValidationError as e:
+        return Response({"errors": e.messages}, status=status.HTTP_400_BAD_REQUEST)
+
+    entries = create_entries(league, request.user, games)
+    return Response(
+        {"league": league.slug, "entries": [{"id": e.id, "date": e.date} for e in entries]},
+        status=status.HTTP_201_CREATED,
+    )
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class ScoreboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'scoreboard'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
+
+        if getattr(settings, 'SCOREBOARD_WARMUP', False):
+            from .warmup import warmup
+            warmup()
@@ -0,0 +1,103 @@
+# ============================================
+# FILE: scoreboard/cache.py
+# ============================================
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib import messages
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from .leagues import get_current_league
+from .models import League
+
+
+def bump_data_version(league_id):
+    """
+    Invalidates everything cached for the league (fragments and ETags keyed
+    by data_version). Inside deferred_data_version() it only takes effect
+    when the block ends.
+    """
+    pending = _deferred_bumps.get()
+    if pending is not None:
+        pending.add(league_id)
+        return
+    League.objects.filter(pk=league_id).update(
+        data_version=F('data_version') + 1,
+        data_updated_at=timezone.now(),
+    )
+
+
+# League ids bumped inside deferred_data_version(), None outside of it
+_deferred_bumps = ContextVar('deferred_data_version_bumps', default=None)
+
+
+@contextmanager
+def deferred_data_version():
+    """
+    For writes touching many rows (each Member or ScoreEntry row saved or
+    deleted bumps its league): every league bumped in the block is bumped
+    once, when the block succeeds.
+    """
+    if _deferred_bumps.get() is not None:
+        yield
+        return
+    pending = set()
+    token = _deferred_bumps.set(pending)
+    try:
+        yield
+    finally:
+        _deferred_bumps.reset(token)
+    for league_id in sorted(pending):
+        bump_data_version(league_id)
+
+
+def bump_all_data_versions():
+    League.objects.update(data_version=F('data_version') + 1, data_updated_at=timezone.now())
+
+
+# ============================================
+# Users (see middleware.CachedAuthenticationMiddleware)
+# ============================================
+
+def user_cache_key(user_id):
+    return f'auth-user:{user_id}'
+
+
+def forget_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+# ============================================
+# Conditional GET (ETag / Last-Modified)
+# ============================================
+
+def _has_pending_messages(request):
+    # A page carrying one-off messages must be rendered, never answered with 304
+    return len(messages.get_messages(request)) > 0
+
+
+def league_etag(request, *args, **kwargs):
+    """
+    ETag for league-scoped HTML pages: changes with the league's data and
+    with the viewer (navigation differs for staff).
+    """
+    if _has_pending_messages(request):
+        return None
+    league = get_current_league(request)
+    return f"{league.pk}-{league.data_version}-{request.user.pk}-{int(request.user.is_staff)}"
+
+
+def league_last_modified(request, *args, **kwargs):
+    if _has_pending_messages(request):
+        return None
+    return get_current_league(request).data_updated_at
+
+
+def overall_image_etag(request, *args, **kwargs):
+    """The overall scoreboard image depends only on the league's data and the query (not the viewer)."""
+    league = get_current_league(request)
+    params = "-".join(request.GET.get(name, '') for name in ('as_of', 'size', 'format'))
+    return f"img-{league.pk}-{league.data_version}-{params}"
@@ -0,0 +1,38 @@
+# ============================================
+# FILE: scoreboard/checks.py
+# ============================================
+
+from django.conf import settings
+from django.core.checks import Warning, register
+
+CACHE_SESSION_ENGINES = (
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+
+@register()
+def per_process_cache_check(app_configs, **kwargs):
+    """
+    Cached sessions and the request.user cache need a cache shared by every
+    worker: with a per-process one, a logout or a password change made in
+    one worker is not seen by the others.
+    """
+    if getattr(settings, 'SHARED_CACHE', True):
+        return []
+
+    errors = []
+    if settings.SESSION_ENGINE in CACHE_SESSION_ENGINES:
+        errors.append(Warning(
+            f"SESSION_ENGINE '{settings.SESSION_ENGINE}' uses a per-process cache.",
+            hint="Set SCOREBOARD_CACHE_BACKEND to a shared backend (Redis, Memcached, database) "
+                 "or SCOREBOARD_SESSION_ENGINE to 'db' or 'signed_cookies'.",
+            id='scoreboard.W001',
+        ))
+    if getattr(settings, 'AUTH_USER_CACHE_SECONDS', 0):
+        errors.append(Warning(
+            "request.user is cached in a per-process cache.",
+            hint="Set SCOREBOARD_CACHE_BACKEND to a shared backend or SCOREBOARD_AUTH_USER_CACHE_SECONDS to 0.",
+            id='scoreboard.W002',
+        ))
+    return errors
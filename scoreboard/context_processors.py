@@ -0,0 +1,14 @@
+# ============================================
+# FILE: scoreboard/context_processors.py
+# ============================================
+
+from .leagues import get_current_league, user_leagues
+
+
+def league(request):
+    if not request.user.is_authenticated:
+        return {}
+    return {
+        "current_league": get_current_league(request),
+        "leagues": user_leagues(request.user),
+    }
@@ -0,0 +1,182 @@
+# ============================================
+# FILE: scoreboard/entries.py
+# ============================================
+
+import csv
+import datetime
+import io
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import Lower
+from django.utils.dateparse import parse_date
+
+from .models import Member, Score, ScoreEntry, Season
+from .stats import entries_added
+
+MIN_PLAYERS = 4
+MAX_PLAYERS = 6
+CSV_COLUMNS = ('game', 'date', 'member', 'score')
+
+# Shortlist offered on the create form: members who scored in the last
+# RECENT_GAMES games, at most RECENT_MEMBERS of them
+RECENT_GAMES = 10
+RECENT_MEMBERS = 12
+
+
+def _parse_game_date(value):
+    if isinstance(value, datetime.date):
+        return value
+    try:
+        date = parse_date(str(value or '').strip())
+    except ValueError:
+        date = None
+    if date is None:
+        raise ValueError(f"invalid date '{value}' (expected YYYY-MM-DD)")
+    return date
+
+
+def validate_games(league, games, members=None):
+    """
+    Checks a whole batch before anything is written. Each game is a dict with
+    "date", optional "image" and "scores": a list of (member, score) pairs where
+    member is a league member, its id or its name.
+
+    Returns the games with dates parsed and scores as {member_id: score};
+    raises ValidationError listing every problem in the batch.
+    """
+    if members is None:
+        members = list(Member.objects.filter(league=league))
+    by_id = {m.id: m for m in members}
+    by_name = {m.name.casefold(): m for m in members}
+    archived_until = Season.archived_until(league.id)
+
+    cleaned, errors = [], []
+    if not games:
+        errors.append("No games submitted.")
+
+    for number, game in enumerate(games, start=1):
+        problems = []
+        try:
+            date = _parse_game_date(game.get('date'))
+        except ValueError as e:
+            problems.append(str(e))
+            date = None
+        if date and archived_until and date <= archived_until:
+            problems.append(f"{date} falls in a closed season (games up to {archived_until} are archived)")
+
+        scores = {}
+        for member, score in game.get('scores', []):
+            if isinstance(member, Member):
+                found = by_id.get(member.id)
+            elif isinstance(member, int):
+                found = by_id.get(member)
+            else:
+                found = by_name.get(str(member).strip().casefold())
+            if found is None:
+                problems.append(f"unknown member '{member}'")
+                continue
+            if found.id in scores:
+                problems.append(f"{found.name} is listed twice")
+                continue
+            try:
+                scores[found.id] = int(score)
+            except (TypeError, ValueError):
+                problems.append(f"invalid score '{score}' for {found.name}")
+
+        if not MIN_PLAYERS <= len(game.get('scores', [])) <= MAX_PLAYERS:
+            problems.append(f"must have scores for {MIN_PLAYERS}-{MAX_PLAYERS} members")
+
+        if problems:
+            errors.append(f"Game {game.get('label', number)}: " + "; ".join(problems))
+        else:
+            cleaned.append({"date": date, "image": game.get('image'), "scores": scores})
+
+    if errors:
+        raise ValidationError(errors)
+    return cleaned
+
+
+def parse_games_csv(text):
+    """
+    Reads game,date,member,score rows (header required); rows sharing a
+    game label form one game. Returns games for validate_games().
+    """
+    reader = csv.DictReader(io.StringIO(text.strip()))
+    missing = [c for c in CSV_COLUMNS if c not in (reader.fieldnames or [])]
+    if missing:
+        raise ValidationError(f"CSV must have a header with columns: {', '.join(CSV_COLUMNS)}")
+
+    games = {}
+    errors = []
+    for line, row in enumerate(reader, start=2):
+        label = (row['game'] or '').strip()
+        if not label:
+            errors.append(f"Line {line}: missing game label")
+            continue
+        game = games.setdefault(label, {"label": label, "date": row['date'], "scores": []})
+        if (row['date'] or '').strip() != (game['date'] or '').strip():
+            errors.append(f"Line {line}: game {label} has more than one date")
+            continue
+        game['scores'].append((row['member'], row['score']))
+
+    if errors:
+        raise ValidationError(errors)
+    return list(games.values())
+
+
+def recent_members(league, games=RECENT_GAMES, limit=RECENT_MEMBERS):
+    """
+    Members with a nonzero score in the league's last `games` games, most
+    games first (then by name), each with .played set. Only reads the Score
+    rows of those games, however large the roster.
+    """
+    last_games = ScoreEntry.objects.filter(league=league).order_by('-date', '-created_at').values('id')[:games]
+    played = dict(
+        Score.objects.filter(league=league, entry__in=last_games).exclude(score=0)
+        .values('member_id').annotate(played=Count('id')).order_by().values_list('member_id', 'played')
+    )
+    members = list(Member.objects.filter(league=league, pk__in=played))
+    for m in members:
+        m.played = played[m.id]
+    return sorted(members, key=lambda m: (-m.played, m.name))[:limit]
+
+
+def search_members(league, prefix):
+    """
+    The league's members whose name starts with `prefix`, ignoring case, and
+    ordered that way. The NOCASE index of migration 0014 serves the match on
+    SQLite (ordering by name would make it pick the unique index instead),
+    the UPPER(name) index of 0010 on PostgreSQL.
+    """
+    return Member.objects.filter(league=league, name__istartswith=prefix).order_by(Lower('name'), 'name')
+
+
+def create_entries(league, user, games, members=None):
+    """
+    Writes validated games (see validate_games) in one transaction: entries
+    and scores are bulk inserted, members who did not play get a 0 score,
+    and derived stats are updated once for the whole batch.
+    """
+    if members is None:
+        member_ids = list(Member.objects.filter(league=league).values_list('id', flat=True))
+    else:
+        member_ids = [m.id for m in members]
+
+    with transaction.atomic():
+        entries = ScoreEntry.objects.bulk_create([
+            ScoreEntry(league=league, date=game['date'], image=game['image'] or '', created_by_id=user.pk)
+            for game in games
+        ])
+        Score.objects.bulk_create(
+            [
+                Score(league=league, entry=entry, member_id=member_id, score=game['scores'].get(member_id, 0))
+                for entry, game in zip(entries, games)
+                for member_id in member_ids
+            ],
+            batch_size=1000,
+        )
+        entries_added(league, entries)
+
+    return entries
@@ -35,6 +35,14 @@ class MemberForm(forms.ModelForm):
             'name': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Enter member name'})
         }
 
+    def clean_name(self):
+        # Names are unique per league; the league is set on the instance, not the form
+        name = self.cleaned_data['name']
+        duplicates = Member.objects.filter(league_id=self.instance.league_id, name=name).exclude(pk=self.instance.pk)
+        if duplicates.exists():
+            raise forms.ValidationError("A member with this name already exists in this league.")
+        return name
+
 class ScoreEntryForm(forms.ModelForm):
     class Meta:
         model = ScoreEntry
@@ -43,3 +51,36 @@ class ScoreEntryForm(forms.ModelForm):
             'date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
             'image': forms.FileInput(attrs={'class': 'form-control'})
         }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Optional on the model for batch/API entries, required when entering one game
+        self.fields['image'].required = True
+
+class BatchScoreEntryForm(forms.Form):
+    csv_file = forms.FileField(
+        required=False,
+        label="CSV file",
+        widget=forms.FileInput(attrs={'class': 'form-control', 'accept': '.csv,text/csv'}),
+    )
+    csv_text = forms.CharField(
+        required=False,
+        label="Or paste CSV",
+        widget=forms.Textarea(attrs={
+            'class': 'form-control',
+            'rows': 12,
+            'placeholder': 'game,date,member,score\n1,2025-01-10,Alice,120\n1,2025-01-10,Bob,80',
+        }),
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        csv_file = cleaned_data.get('csv_file')
+        if csv_file:
+            try:
+                cleaned_data['csv_text'] = csv_file.read().decode('utf-8-sig')
+            except UnicodeDecodeError:
+                raise forms.ValidationError("CSV file must be UTF-8 encoded")
+        if not (cleaned_data.get('csv_text') or '').strip():
+            raise forms.ValidationError("Upload a CSV file or paste CSV rows")
+        return cleaned_data
@@ -0,0 +1,326 @@
+# ============================================
+# FILE: scoreboard/images.py
+# ============================================
+#
+# Pillow is only needed by the image downloads, so this module is imported
+# lazily from those views (and from the optional startup warmup) instead of
+# at views.py load time.
+
+import functools
+import io
+
+from django.core.cache import cache
+from django.db.models import Max
+from django.utils.dateparse import parse_date
+from PIL import Image, ImageDraw, ImageFont
+
+from .models import Member, ScoreEntry
+from .stats import standings_as_of, win_rate
+
+FONT_REGULAR = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+FONT_BOLD = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+
+# (path, size) pairs used by the full-size renderers below, preloaded by warmup
+FONTS = (
+    (FONT_BOLD, 60), (FONT_REGULAR, 32), (FONT_BOLD, 38), (FONT_BOLD, 42),
+    (FONT_BOLD, 80), (FONT_BOLD, 52), (FONT_REGULAR, 40),
+)
+
+# name -> (Pillow format, content type, file extension, save options). The
+# images are flat colors and text: PNG is quantized to a small palette,
+# WebP/JPEG use moderate lossy settings.
+IMAGE_FORMATS = {
+    'png': ('PNG', 'image/png', 'png', {'optimize': True}),
+    'webp': ('WEBP', 'image/webp', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'image/jpeg', 'jpg', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+PNG_COLORS = 64
+
+# Overall scoreboard sizes: name -> (width, members shown). "small" is meant
+# for chat bot embeds.
+OVERALL_SIZES = {
+    'full': (1000, 8),
+    'medium': (600, 8),
+    'small': (400, 5),
+}
+
+# Rendered images are keyed by the league's data version, so they only
+# expire to free space
+IMAGE_CACHE_SECONDS = 24 * 60 * 60
+
+WIDTH, HEIGHT = 1000, 1400
+BG_COLOR = (26, 32, 44)  # Dark blue-gray
+RANK_COLORS = [
+    (255, 215, 0),    # 1st - Gold
+    (192, 192, 192),  # 2nd - Silver
+    (205, 127, 50),   # 3rd - Bronze
+]
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(path, size):
+    """Loads a TrueType font once per process; falls back to Pillow's default font."""
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def preload_fonts():
+    for path, size in FONTS:
+        get_font(path, size)
+
+
+def encode_image(img, image_format='png'):
+    pil_format, _, _, options = IMAGE_FORMATS[image_format]
+    if pil_format == 'PNG':
+        img = img.quantize(PNG_COLORS, dither=Image.Dither.NONE)
+    buffer = io.BytesIO()
+    img.save(buffer, format=pil_format, **options)
+    return buffer.getvalue()
+
+
+def render_entry_scoreboard(entry, scores):
+    """PNG bytes for one game: title, date, the uploaded photo and up to 8 score rows."""
+    width, height = WIDTH, HEIGHT
+
+    # Create image
+    img = Image.new('RGB', (width, height), BG_COLOR)
+    draw = ImageDraw.Draw(img)
+
+    # Load fonts
+    title_font = get_font(FONT_BOLD, 60)
+    date_font = get_font(FONT_REGULAR, 32)
+    name_font = get_font(FONT_BOLD, 38)
+    score_font = get_font(FONT_BOLD, 42)
+
+    y_pos = 40
+
+    # Title
+    title = "🏆 SCOREBOARD 🏆"
+    title_bbox = draw.textbbox((0, 0), title, font=title_font)
+    title_width = title_bbox[2] - title_bbox[0]
+    draw.text(((width - title_width) / 2, y_pos), title, fill=(255, 215, 0), font=title_font)
+    y_pos += 90
+
+    # Date
+    date_text = entry.date.strftime("%B %d, %Y")
+    date_bbox = draw.textbbox((0, 0), date_text, font=date_font)
+    date_width = date_bbox[2] - date_bbox[0]
+    draw.text(((width - date_width) / 2, y_pos), date_text, fill=(203, 213, 225), font=date_font)
+    y_pos += 60
+
+    # Uploaded image
+    if entry.image:
+        try:
+            uploaded_img = Image.open(entry.image.path)
+            # Resize to fit
+            max_img_width, max_img_height = 900, 350
+            uploaded_img.thumbnail((max_img_width, max_img_height), Image.Resampling.LANCZOS)
+
+            # Center and paste
+            img_x = (width - uploaded_img.width) // 2
+            img.paste(uploaded_img, (img_x, y_pos))
+            y_pos += uploaded_img.height + 40
+        except Exception as e:
+            print(f"Error loading image: {e}")
+            y_pos += 20
+
+    # Draw separator
+    draw.rectangle([(100, y_pos), (900, y_pos + 3)], fill=(100, 116, 139))
+    y_pos += 30
+
+    # Draw scores
+    for i, score in enumerate(scores):
+        # Determine color
+        if i < 3:
+            color = RANK_COLORS[i]
+        else:
+            color = (148, 163, 184)  # Gray for others
+
+        # Background box
+        box_height = 85
+        box_y = y_pos + (i * (box_height + 10))
+
+        # Draw rounded rectangle effect
+        draw.rectangle([(80, box_y), (920, box_y + box_height)],
+                      fill=(45, 55, 72), outline=color, width=3)
+
+        # Rank badge
+        rank_text = f"#{i + 1}"
+        draw.ellipse([(100, box_y + 15), (160, box_y + 70)], fill=color)
+        rank_bbox = draw.textbbox((0, 0), rank_text, font=name_font)
+        rank_w = rank_bbox[2] - rank_bbox[0]
+        rank_h = rank_bbox[3] - rank_bbox[1]
+        draw.text((130 - rank_w/2, box_y + 42 - rank_h/2), rank_text, fill=(26, 32, 44), font=name_font)
+
+        # Member name
+        draw.text((190, box_y + 22), score.member.name, fill=(255, 255, 255), font=name_font)
+
+        # Score
+        score_text = str(score.score)
+        score_bbox = draw.textbbox((0, 0), score_text, font=score_font)
+        score_width = score_bbox[2] - score_bbox[0]
+        draw.text((880 - score_width, box_y + 20), score_text, fill=color, font=score_font)
+
+    # Footer
+    footer_y = height - 50
+    footer_text = f"Generated by {entry.created_by.username}"
+    footer_bbox = draw.textbbox((0, 0), footer_text, font=date_font)
+    footer_width = footer_bbox[2] - footer_bbox[0]
+    draw.text(((width - footer_width) / 2, footer_y), footer_text, fill=(100, 116, 139), font=date_font)
+
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def render_overall_scoreboard(members, date_text, width=WIDTH):
+    """
+    The standings for up to 8 members (with .total_score set), laid out for
+    WIDTH and drawn natively at `width`; the height follows the row count.
+    """
+    scale = width / WIDTH
+
+    def px(value):
+        return round(value * scale)
+
+    header, row_height, gap, footer_height = 244, 115, 18, 92
+    height = px(header + len(members) * (row_height + gap) + footer_height)
+    img = Image.new("RGB", (width, height), BG_COLOR)
+    draw = ImageDraw.Draw(img)
+
+    name_font = get_font(FONT_BOLD, px(52))
+    score_font = get_font(FONT_BOLD, px(60))
+    date_font = get_font(FONT_REGULAR, px(40))
+
+    # Title, shrunk until it fits the width
+    title = "🏆 OVERALL SCOREBOARD 🏆"
+    title_size = 80
+    while True:
+        title_font = get_font(FONT_BOLD, px(title_size))
+        title_bbox = draw.textbbox((0, 0), title, font=title_font)
+        title_w = title_bbox[2] - title_bbox[0]
+        if title_w <= width - px(80) or title_size <= 20:
+            break
+        title_size -= 4
+    draw.text(((width - title_w) / 2, px(40)), title, fill=(255, 215, 0), font=title_font)
+
+    # Date of the latest game included (not today: same data, same image)
+    date_bbox = draw.textbbox((0, 0), date_text, font=date_font)
+    date_w = date_bbox[2] - date_bbox[0]
+    draw.text(((width - date_w) / 2, px(150)), date_text, fill=(203, 213, 225), font=date_font)
+
+    # Separator
+    draw.rectangle([(px(100), px(214)), (px(900), px(218))], fill=(100, 116, 139))
+
+    for i, m in enumerate(members):
+        total_score = m.total_score or 0
+
+        # Negative score -> red
+        score_color = (255, 60, 60) if total_score < 0 else (255, 255, 255)
+
+        # Outline color by rank
+        if i < 3:
+            outline_color = RANK_COLORS[i]
+        else:
+            outline_color = (148, 163, 184)
+
+        box_y = px(header + i * (row_height + gap))
+        box_h = px(row_height)
+
+        # Row box
+        draw.rectangle(
+            [(px(80), box_y), (px(920), box_y + box_h)],
+            fill=(45, 55, 72),
+            outline=outline_color,
+            width=max(1, px(5)),
+        )
+
+        # Rank text
+        rank_text = f"#{i + 1}"
+        rank_bbox = draw.textbbox((0, 0), rank_text, font=name_font)
+        draw.text(
+            (px(110), box_y + (box_h - (rank_bbox[3] - rank_bbox[1])) / 2 - rank_bbox[1]),
+            rank_text,
+            fill=outline_color,
+            font=name_font,
+        )
+
+        # Member name
+        name_bbox = draw.textbbox((0, 0), m.name, font=name_font)
+        draw.text(
+            (px(250), box_y + (box_h - (name_bbox[3] - name_bbox[1])) / 2 - name_bbox[1]),
+            m.name, fill=(255, 255, 255), font=name_font,
+        )
+
+        # Score (right aligned)
+        score_text = str(total_score)
+        score_bbox = draw.textbbox((0, 0), score_text, font=score_font)
+        score_w = score_bbox[2] - score_bbox[0]
+        draw.text(
+            (px(890) - score_w, box_y + (box_h - (score_bbox[3] - score_bbox[1])) / 2 - score_bbox[1]),
+            score_text, fill=score_color, font=score_font,
+        )
+
+    # Footer
+    footer = "Overall Scoreboard (Auto-generated)"
+    footer_font = get_font(FONT_REGULAR, px(32))
+    footer_bbox = draw.textbbox((0, 0), footer, font=footer_font)
+    footer_w = footer_bbox[2] - footer_bbox[0]
+    draw.text(
+        ((width - footer_w) / 2, height - px(60)),
+        footer,
+        fill=(100, 116, 139),
+        font=footer_font,
+    )
+
+    return img
+
+
+def overall_image_options(params):
+    """(as_of, size, image_format) from ?as_of=, ?size= and ?format= query parameters; ValueError if invalid."""
+    as_of = None
+    if params.get('as_of'):
+        try:
+            as_of = parse_date(params['as_of'])
+        except ValueError:
+            pass
+        if as_of is None:
+            raise ValueError("as_of must be a valid date (YYYY-MM-DD)")
+    size = params.get('size') or 'full'
+    image_format = (params.get('format') or 'png').lower().replace('jpg', 'jpeg')
+    if size not in OVERALL_SIZES:
+        raise ValueError(f"size must be one of: {', '.join(OVERALL_SIZES)}")
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(IMAGE_FORMATS)}")
+    return as_of, size, image_format
+
+
+def overall_scoreboard_image(league, as_of=None, size='full', image_format='png'):
+    """
+    Encoded overall scoreboard of the league's games up to `as_of` (default:
+    all). Output depends only on the data, so it is cached per data version.
+    """
+    key = f"overall-scoreboard:{league.pk}:{league.data_version}:{as_of}:{size}:{image_format}"
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    width, shown = OVERALL_SIZES[size]
+    standings = standings_as_of(league, as_of)
+    members = list(Member.objects.filter(league=league))
+    for m in members:
+        m.total_score = standings[m.id]['total_score']
+        m.win_rate = win_rate(standings[m.id])
+    members = sorted(members, key=lambda m: (-m.total_score, -m.win_rate, m.name))[:shown]
+
+    games = ScoreEntry.objects.filter(league=league)
+    if as_of:
+        games = games.filter(date__lte=as_of)
+    last_game = games.aggregate(last=Max('date'))['last']
+    date_text = last_game.strftime("%B %d, %Y") if last_game else "No games yet"
+
+    data = encode_image(render_overall_scoreboard(members, date_text, width), image_format)
+    cache.set(key, data, IMAGE_CACHE_SECONDS)
+    return data
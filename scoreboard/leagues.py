@@ -0,0 +1,54 @@
+# ============================================
+# FILE: scoreboard/leagues.py
+# ============================================
+
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+
+from .models import League
+
+LEAGUE_SESSION_KEY = 'league_id'
+
+
+def user_leagues(user):
+    """Leagues the user may open: those listing them in League.users, every league for superusers."""
+    if not user.is_authenticated:
+        return League.objects.none()
+    if user.is_superuser:
+        return League.objects.all()
+    return League.objects.filter(users=user.pk)
+
+
+def get_current_league(request):
+    """
+    League for this request, among the user's leagues: ?league=<slug>
+    (remembered in the session; 404 for other leagues), then the league
+    stored in the session, then the user's oldest league.
+    """
+    if hasattr(request, '_league'):
+        return request._league
+
+    leagues = user_leagues(request.user)
+    league = None
+    slug = request.GET.get('league')
+    if slug:
+        league = leagues.filter(slug=slug).first()
+        if league is None:
+            raise Http404("No such league.")
+        # Only remembered for clients that already have a session: stateless
+        # API clients would otherwise create (and store) one on every call.
+        if request.session.session_key and request.session.get(LEAGUE_SESSION_KEY) != league.id:
+            request.session[LEAGUE_SESSION_KEY] = league.id
+
+    if league is None and LEAGUE_SESSION_KEY in request.session:
+        league = leagues.filter(pk=request.session[LEAGUE_SESSION_KEY]).first()
+
+    if league is None:
+        league = leagues.order_by('pk').first()
+    if league is None:
+        if not request.user.is_superuser:
+            raise PermissionDenied("You have not been added to a league yet.")
+        league, _ = League.objects.get_or_create(slug='default', defaults={'name': 'Default'})
+
+    request._league = league
+    return league
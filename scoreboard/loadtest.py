@@ -0,0 +1,327 @@
+# ============================================
+# FILE: scoreboard/loadtest.py
+# ============================================
+#
+# Game-night traffic against a running server (runserver, gunicorn, uvicorn,
+# ...), using nothing but asyncio: every virtual user keeps its own
+# keep-alive connection and cookies. Driven by `manage.py loadtest`.
+
+import asyncio
+import datetime
+import json
+import math
+import random
+import re
+import ssl
+import time
+from collections import defaultdict
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+from django.urls import reverse
+
+ENTRY_LINK = re.compile(r'href="[^"]*/scores/(\d+)/"')
+CSRF_INPUT = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+class HttpError(Exception):
+    pass
+
+
+class HttpClient:
+    """Minimal HTTP/1.1 client: one keep-alive connection, a cookie jar, no redirects."""
+
+    def __init__(self, base_url, timeout=30):
+        url = urlsplit(base_url)
+        self.scheme = url.scheme or 'http'
+        self.host = url.hostname
+        self.port = url.port or (443 if self.scheme == 'https' else 80)
+        self.netloc = url.netloc
+        self.base_url = f"{self.scheme}://{url.netloc}"
+        self.timeout = timeout
+        self.cookies = {}
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=b'', headers=None):
+        """Returns (status, headers, body); retries once on a dropped keep-alive connection."""
+        for attempt in (1, 2):
+            reused = self.writer is not None
+            try:
+                return await asyncio.wait_for(self._send(method, path, body, headers or {}), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                await self.close()
+                if not reused or attempt == 2:
+                    raise HttpError(f"{method} {path}: {e!r}") from e
+            except asyncio.TimeoutError as e:
+                await self.close()
+                raise HttpError(f"{method} {path}: timed out") from e
+
+    async def _send(self, method, path, body, headers):
+        if self.writer is None:
+            context = ssl.create_default_context() if self.scheme == 'https' else None
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=context)
+
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.netloc}", "Connection: keep-alive"]
+        if self.cookies:
+            lines.append("Cookie: " + "; ".join(f"{k}={v}" for k, v in self.cookies.items()))
+        if body or method not in ('GET', 'HEAD'):
+            lines.append(f"Content-Length: {len(body)}")
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readuntil(b"\r\n")
+        if not status_line:
+            raise ConnectionError("connection closed")
+        status = int(status_line.split()[1])
+        response_headers = defaultdict(list)
+        while True:
+            line = (await self.reader.readuntil(b"\r\n")).decode('latin-1').rstrip("\r\n")
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            response_headers[name.strip().lower()].append(value.strip())
+
+        for header in response_headers.get('set-cookie', []):
+            for name, morsel in SimpleCookie(header).items():
+                if morsel['max-age'] == '0' or not morsel.value:
+                    self.cookies.pop(name, None)
+                else:
+                    self.cookies[name] = morsel.value
+
+        closes = 'close' in ",".join(response_headers.get('connection', [])).lower()
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            content = b''
+        elif 'chunked' in ",".join(response_headers.get('transfer-encoding', [])).lower():
+            content = await self._read_chunked()
+        elif 'content-length' in response_headers:
+            content = await self.reader.readexactly(int(response_headers['content-length'][0]))
+        else:
+            content = await self.reader.read()
+            closes = True
+
+        if closes:
+            await self.close()
+        return status, response_headers, content
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            if size == 0:
+                while (await self.reader.readuntil(b"\r\n")) != b"\r\n":
+                    pass
+                return b"".join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)
+
+
+class Stats:
+    """
+    Latencies (seconds), statuses and errors (unexpected status or no
+    response) per URL name. Requests are counted whether answered or
+    dropped; req/s only counts those started within `window`, the
+    (start, end) time.monotonic() span of the steady state.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.errors = defaultdict(int)
+        self.requests = defaultdict(int)
+        self.steady = defaultdict(int)
+
+    def count(self, name, started):
+        self.requests[name] += 1
+        if self.window[0] <= started < self.window[1]:
+            self.steady[name] += 1
+
+    @property
+    def window_seconds(self):
+        return self.window[1] - self.window[0]
+
+    def report(self):
+        rows = []
+        for name in sorted(self.requests):
+            times = sorted(self.latencies[name])
+            rows.append({
+                "name": name,
+                "requests": self.requests[name],
+                "errors": self.errors[name],
+                "rps": self.steady[name] / self.window_seconds if self.window_seconds else 0,
+                "p50": percentile(times, 50),
+                "p95": percentile(times, 95),
+                "p99": percentile(times, 99),
+                "max": times[-1] if times else None,
+                "statuses": dict(self.statuses[name]),
+            })
+        return rows
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    # Nearest-rank method
+    return sorted_values[max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)]
+
+
+class VirtualUser:
+    """One logged-in client running a scenario; every request is recorded under its URL name."""
+
+    def __init__(self, base_url, username, password, stats, league=None, think=1.0):
+        self.client = HttpClient(base_url)
+        self.username = username
+        self.password = password
+        self.stats = stats
+        self.league = league
+        self.think = think
+        self.access_token = None
+
+    def path(self, name, *args, **query):
+        if self.league:
+            query.setdefault('league', self.league)
+        url = reverse(name, args=args)
+        return f"{url}?{urlencode(query)}" if query else url
+
+    async def call(self, name, path, method='GET', body=b'', headers=None, expect=(200, 304)):
+        self.stats.count(name, time.monotonic())
+        start = time.perf_counter()
+        try:
+            status, response_headers, content = await self.client.request(method, path, body, headers)
+        except HttpError:
+            self.stats.errors[name] += 1
+            return None, {}, b''
+        self.stats.latencies[name].append(time.perf_counter() - start)
+        self.stats.statuses[name][status] += 1
+        if status not in expect:
+            self.stats.errors[name] += 1
+        return status, response_headers, content
+
+    async def pause(self):
+        await asyncio.sleep(random.uniform(0.5, 1.5) * self.think)
+
+    async def login(self):
+        _, _, page = await self.call('login', reverse('login'))
+        match = CSRF_INPUT.search(page.decode('utf-8', 'replace'))
+        if not match:
+            raise HttpError("login page has no CSRF token")
+        body = urlencode({
+            'csrfmiddlewaretoken': match.group(1),
+            'username': self.username,
+            'password': self.password,
+        }).encode()
+        status, headers, _ = await self.call('login', reverse('login'), 'POST', body, {
+            'Content-Type': 'application/x-www-form-urlencoded',
+            'Referer': self.client.base_url + reverse('login'),
+            'Origin': self.client.base_url,
+        }, expect=(302,))
+        if status != 302 or 'sessionid' not in self.client.cookies:
+            raise HttpError(f"login failed for {self.username} (HTTP {status})")
+
+    async def obtain_token(self):
+        body = json.dumps({'username': self.username, 'password': self.password}).encode()
+        status, _, content = await self.call('api_token', reverse('api_token'), 'POST', body, {
+            'Content-Type': 'application/json',
+        })
+        if status != 200:
+            raise HttpError(f"token request failed for {self.username} (HTTP {status})")
+        self.access_token = json.loads(content)['access']
+
+    async def entry_ids(self):
+        _, _, page = await self.call('score_entry_list', self.path('score_entry_list'))
+        return [int(pk) for pk in ENTRY_LINK.findall(page.decode('utf-8', 'replace'))]
+
+    # ============================================
+    # Scenarios
+    # ============================================
+
+    async def dashboard(self, deadline):
+        """Polls the dashboard like an open browser tab, revalidating with the last ETag."""
+        etag = None
+        while time.monotonic() < deadline:
+            headers = {'If-None-Match': etag} if etag else {}
+            status, response_headers, _ = await self.call('dashboard', self.path('dashboard'), headers=headers)
+            if status == 200:
+                etag = (response_headers.get('etag') or [None])[0]
+            await self.pause()
+
+    async def entries(self, deadline):
+        """Opens the entry list, then a few entries from it."""
+        while time.monotonic() < deadline:
+            ids = await self.entry_ids()
+            for pk in random.sample(ids, min(3, len(ids))):
+                await self.call('score_entry_detail', self.path('score_entry_detail', pk))
+                await self.pause()
+            await self.pause()
+
+    async def images(self, deadline):
+        """Downloads game and overall scoreboard PNGs."""
+        ids = await self.entry_ids()
+        while time.monotonic() < deadline:
+            if ids:
+                await self.call('generate_scoreboard', self.path('generate_scoreboard', random.choice(ids)))
+            await self.call('overall_scoreboard_download', self.path('overall_scoreboard_download'))
+            await self.pause()
+
+    async def submit(self, deadline, burst=5):
+        """Bursts of single-game submissions through the JSON API (writes real entries)."""
+        await self.obtain_token()
+        headers = {'Authorization': f'Bearer {self.access_token}'}
+        _, _, content = await self.call('api_head_to_head', self.path('api_head_to_head'), headers=headers)
+        members = [m['id'] for m in json.loads(content or b'{}').get('members', [])]
+        if len(members) < 4:
+            raise HttpError("submit scenario needs a league with at least 4 members")
+
+        headers['Content-Type'] = 'application/json'
+        while time.monotonic() < deadline:
+            for _ in range(burst):
+                players = random.sample(members, random.randint(4, min(6, len(members))))
+                game = {
+                    'date': datetime.date.today().isoformat(),
+                    'scores': [{'member_id': pk, 'score': random.randint(-50, 150) or 1} for pk in players],
+                }
+                await self.call(
+                    'api_score_entry_batch', self.path('api_score_entry_batch'), 'POST',
+                    json.dumps({'games': [game]}).encode(), headers, expect=(201,),
+                )
+            await asyncio.sleep(self.think * 10)
+
+
+SCENARIOS = ('dashboard', 'entries', 'images', 'submit')
+
+
+async def run(base_url, users, scenarios, concurrency, duration, league=None, think=1.0, ramp_up=0.0):
+    """
+    Starts `concurrency` virtual users (users and scenarios assigned round
+    robin, logins spread over `ramp_up` seconds) and runs them for
+    `duration` seconds. Returns (Stats, elapsed seconds, failed virtual users);
+    the Stats window is those `duration` seconds after the ramp-up.
+    """
+    start = time.monotonic()
+    deadline = start + ramp_up + duration
+    stats = Stats(window=(start + ramp_up, deadline))
+
+    async def virtual_user(number):
+        username, password = users[number % len(users)]
+        scenario = scenarios[number % len(scenarios)]
+        user = VirtualUser(base_url, username, password, stats, league=league, think=think)
+        try:
+            await asyncio.sleep(ramp_up * number / concurrency)
+            await user.login()
+            await getattr(user, scenario)(deadline)
+        finally:
+            await user.client.close()
+
+    results = await asyncio.gather(*(virtual_user(n) for n in range(concurrency)), return_exceptions=True)
+    failures = [r for r in results if isinstance(r, Exception)]
+    return stats, time.monotonic() - start, failures
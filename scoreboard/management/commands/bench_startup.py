@@ -0,0 +1,68 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter: load the WSGI app, then serve one request.
+FIRST_REQUEST = """
+import os, sys, time
+t0 = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+t1 = time.perf_counter()
+from django.contrib.auth import get_user_model
+from django.test import Client
+client = Client(HTTP_HOST='127.0.0.1')
+username = os.environ.get('BENCH_USER')
+if username:
+    client.force_login(get_user_model().objects.get(username=username))
+t2 = time.perf_counter()
+response = client.get(sys.argv[1])
+t3 = time.perf_counter()
+print(t1 - t0, t3 - t2, response.status_code, int('PIL' in sys.modules))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure worker startup: wall time of `manage.py check`, app load time and "
+        "first-request latency, each in a fresh interpreter."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help="Runs per measurement (default: 5).")
+        parser.add_argument('--url', default='/login/', help="Path of the first request (default: /login/).")
+        parser.add_argument('--user', help="Log in as this user before the first request.")
+        parser.add_argument('--warmup', action='store_true', help="Run with SCOREBOARD_WARMUP enabled.")
+
+    def handle(self, *args, **options):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'scoreboard_project.settings')}
+        env['SCOREBOARD_WARMUP'] = '1' if options['warmup'] else ''
+        if options['user']:
+            env['BENCH_USER'] = options['user']
+
+        check, load, first = [], [], []
+        for _ in range(options['repeat']):
+            start = time.perf_counter()
+            self._run([sys.executable, 'manage.py', 'check'], env)
+            check.append(time.perf_counter() - start)
+
+            output = self._run([sys.executable, '-c', FIRST_REQUEST, options['url']], env)
+            load_time, request_time, status, pil_loaded = output.split()[-4:]
+            load.append(float(load_time))
+            first.append(float(request_time))
+
+        self.stdout.write(f"warmup: {'on' if options['warmup'] else 'off'}, runs: {options['repeat']}")
+        for label, times in (("manage.py check", check), ("app load", load), (f"first GET {options['url']}", first)):
+            self.stdout.write(f"  {label:<32} median {statistics.median(times) * 1000:8.1f} ms   min {min(times) * 1000:8.1f} ms")
+        self.stdout.write(f"  last response: {status}, Pillow imported: {'yes' if pil_loaded == '1' else 'no'}")
+
+    def _run(self, command, env):
+        result = subprocess.run(command, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise CommandError(f"{' '.join(command[:3])} failed:\n{result.stderr}")
+        return result.stdout
@@ -0,0 +1,25 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from scoreboard.models import Season
+from scoreboard.seasons import close_season
+
+
+class Command(BaseCommand):
+    help = "Close a completed season: summarize its games per member and move their scores to the archive table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('league', help="League slug.")
+        parser.add_argument('season', help="Season name.")
+
+    def handle(self, *args, **options):
+        try:
+            season = Season.objects.get(league__slug=options['league'], name=options['season'])
+        except Season.DoesNotExist:
+            raise CommandError(f"Season '{options['season']}' of league '{options['league']}' does not exist.")
+
+        try:
+            close_season(season)
+        except ValidationError as e:
+            raise CommandError("; ".join(e.messages))
+        self.stdout.write(self.style.SUCCESS(f"{season}: {season.entry_count} games archived."))
@@ -0,0 +1,69 @@
+import asyncio
+
+from django.core.management.base import BaseCommand, CommandError
+
+from scoreboard.loadtest import SCENARIOS, run
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate game-night traffic against a running server and report throughput and "
+        "p50/p95/p99 latency per URL name. The 'submit' scenario writes real entries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help="Server base URL (default: http://127.0.0.1:8000).")
+        parser.add_argument(
+            '--user', action='append', dest='users', metavar='USERNAME:PASSWORD', required=True,
+            help="Seeded account to log in with; repeat to spread virtual users over several accounts.",
+        )
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios', choices=SCENARIOS,
+            help="Scenario to run; repeat to mix (default: dashboard, entries, images).",
+        )
+        parser.add_argument('--concurrency', type=int, default=10, help="Virtual users (default: 10).")
+        parser.add_argument('--duration', type=float, default=30, help="Seconds to run after ramp-up (default: 30).")
+        parser.add_argument('--ramp-up', type=float, default=5, help="Seconds over which users log in (default: 5).")
+        parser.add_argument('--think', type=float, default=1.0, help="Mean pause between a user's requests in seconds (default: 1).")
+        parser.add_argument('--league', help="League slug to request (default: each user's current league).")
+
+    def handle(self, *args, **options):
+        users = []
+        for value in options['users']:
+            username, sep, password = value.partition(':')
+            if not sep:
+                raise CommandError(f"--user must be USERNAME:PASSWORD, got '{value}'.")
+            users.append((username, password))
+        scenarios = options['scenarios'] or ['dashboard', 'entries', 'images']
+
+        self.stdout.write(
+            f"{options['concurrency']} users ({', '.join(scenarios)}) against {options['url']} "
+            f"for {options['duration']:g}s after {options['ramp_up']:g}s ramp-up..."
+        )
+        stats, elapsed, failures = asyncio.run(run(
+            options['url'], users, scenarios, options['concurrency'], options['duration'],
+            league=options['league'], think=options['think'], ramp_up=options['ramp_up'],
+        ))
+
+        def ms(seconds):
+            return f"{seconds * 1000:9.1f}" if seconds is not None else f"{'-':>9}"
+
+        self.stdout.write(f"\n{'URL name':<30} {'requests':>8} {'errors':>6} {'req/s':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}  statuses")
+        total = rps = 0
+        for row in stats.report():
+            total += row['requests']
+            rps += row['rps']
+            statuses = ", ".join(f"{code}: {count}" for code, count in sorted(row['statuses'].items()))
+            self.stdout.write(
+                f"{row['name']:<30} {row['requests']:>8} {row['errors']:>6} {row['rps']:>7.1f} "
+                f"{ms(row['p50'])} {ms(row['p95'])} {ms(row['p99'])} {ms(row['max'])}  {statuses}"
+            )
+        self.stdout.write(
+            f"\n{total} requests in {elapsed:.1f}s; {rps:.1f} req/s over the "
+            f"{stats.window_seconds:g}s after ramp-up (answered or dropped)"
+        )
+
+        for failure in failures:
+            self.stderr.write(f"virtual user stopped: {failure}")
+        if failures and len(failures) == options['concurrency']:
+            raise CommandError("Every virtual user failed.")
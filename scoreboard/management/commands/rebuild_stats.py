@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from scoreboard.models import League
+from scoreboard.stats import rebuild_head_to_head, rebuild_snapshots
+
+
+class Command(BaseCommand):
+    help = "Recompute derived statistics (head-to-head table, standings snapshots) from all score entries."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--league', help="Slug of a single league to rebuild (default: all leagues).")
+
+    def handle(self, *args, **options):
+        leagues = League.objects.all()
+        if options['league']:
+            leagues = leagues.filter(slug=options['league'])
+            if not leagues:
+                raise CommandError(f"League '{options['league']}' does not exist.")
+
+        for league in leagues:
+            rebuild_head_to_head(league)
+            rebuild_snapshots(league)
+            self.stdout.write(self.style.SUCCESS(f"{league}: head-to-head table and standings snapshots rebuilt."))
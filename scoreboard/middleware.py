@@ -0,0 +1,138 @@
+# ============================================
+# FILE: scoreboard/middleware.py
+# ============================================
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.urls import reverse
+from django.utils.functional import SimpleLazyObject
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+
+from .cache import user_cache_key
+from .routers import use_primary
+
+PRIMARY_PIN_COOKIE = 'pin_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class PrimaryPinningMiddleware:
+    """
+    Keeps a client on the primary database for DATABASE_PRIMARY_PIN_SECONDS
+    after it writes, so e.g. the redirect to a new entry's detail page does
+    not race replication lag.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        writes = request.method not in SAFE_METHODS
+        token = use_primary.set(writes or PRIMARY_PIN_COOKIE in request.COOKIES)
+        try:
+            response = self.get_response(request)
+        finally:
+            use_primary.reset(token)
+
+        if writes:
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE, '1',
+                max_age=getattr(settings, 'DATABASE_PRIMARY_PIN_SECONDS', 10),
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+def get_cached_user(request):
+    """
+    Like django.contrib.auth.get_user(), but the user row comes from the cache
+    when possible. The session auth hash is still checked against the cached
+    user; anything unusual falls back to the regular (database) lookup.
+    """
+    if not hasattr(request, '_cached_user'):
+        user = None
+        user_id = request.session.get(auth.SESSION_KEY)
+        session_hash = request.session.get(auth.HASH_SESSION_KEY)
+        if user_id is not None and session_hash:
+            cached = cache.get(user_cache_key(user_id))
+            if (
+                cached is not None
+                and cached.is_active
+                and constant_time_compare(session_hash, cached.get_session_auth_hash())
+            ):
+                user = cached
+
+        if user is None:
+            user = auth.get_user(request)
+            if user.is_authenticated:
+                cache.set(user_cache_key(user.pk), user, settings.AUTH_USER_CACHE_SECONDS)
+
+        request._cached_user = user
+    return request._cached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    AuthenticationMiddleware that serves request.user from the cache, so a
+    page hit does not have to fetch the auth_user row (see get_cached_user).
+    Behaves like AuthenticationMiddleware when AUTH_USER_CACHE_SECONDS is 0.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        if not getattr(settings, 'AUTH_USER_CACHE_SECONDS', 0):
+            return
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
+
+
+def profiling_user_id(request):
+    """
+    Id of the staff user allowed to profile this request, else None. API
+    clients authenticate per view, so a bearer token's is_staff claim
+    counts too.
+    """
+    if request.user.is_staff:
+        return request.user.pk
+    try:
+        authenticated = JWTStatelessUserAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    if authenticated and authenticated[0].is_staff:
+        return authenticated[0].pk
+    return None
+
+
+class RequestProfilingMiddleware:
+    """
+    Profiles requests that ask for it (?profile=sample|cprofile or an
+    X-Profile header) when made by staff and REQUEST_PROFILING is on. The
+    profile is stored as a RequestProfile; the response links to it in the
+    X-Profile-Url header and carries Server-Timing totals.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        wanted = 'profile' in request.GET or 'X-Profile' in request.headers
+        if not wanted or not getattr(settings, 'REQUEST_PROFILING', False):
+            return self.get_response(request)
+
+        # Only imported when asked for: keeps cProfile & co. off startup
+        from . import profiling
+
+        mode = profiling.requested_mode(request)
+        user_id = profiling_user_id(request) if mode else None
+        if user_id is None:
+            return self.get_response(request)
+
+        response, profile = profiling.profile_request(request, self.get_response, mode, user_id)
+        response['X-Profile-Url'] = request.build_absolute_uri(
+            reverse('admin:scoreboard_requestprofile_change', args=[profile.pk])
+        )
+        response['Server-Timing'] = f'app;dur={profile.duration_ms:.1f}, sql;dur={profile.sql_ms:.1f};desc="{profile.sql_count} queries"'
+        return response
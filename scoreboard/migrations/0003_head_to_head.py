@@ -0,0 +1,37 @@
+# Generated by Django 4.2.26 on 2026-10-19 02:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scoreboard', '0002_alter_score_member'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HeadToHead',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('wins', models.PositiveIntegerField(default=0)),
+                ('losses', models.PositiveIntegerField(default=0)),
+                ('draws', models.PositiveIntegerField(default=0)),
+                ('games', models.PositiveIntegerField(default=0)),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='head_to_head', to='scoreboard.member')),
+                ('opponent', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='scoreboard.member')),
+            ],
+            options={
+                'verbose_name_plural': 'Head to Head',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='headtohead',
+            constraint=models.CheckConstraint(check=models.Q(('member__lt', models.F('opponent'))), name='head_to_head_ordered_pair'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='headtohead',
+            unique_together={('member', 'opponent')},
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.26 on 2026-10-19 02:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scoreboard', '0003_head_to_head'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StandingsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('standings', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='scoreentry',
+            index=models.Index(fields=['date'], name='scoreboard__date_1daf53_idx'),
+        ),
+    ]
@@ -0,0 +1,105 @@
+# Generated by Django 4.2.26 on 2026-10-19 02:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+LEAGUE_MODELS = ['member', 'scoreentry', 'score', 'headtohead', 'standingssnapshot']
+
+
+def assign_default_league(apps, schema_editor):
+    League = apps.get_model('scoreboard', 'League')
+    league, _ = League.objects.get_or_create(slug='default', defaults={'name': 'Default'})
+    for model_name in LEAGUE_MODELS:
+        apps.get_model('scoreboard', model_name).objects.update(league=league)
+
+
+def league_field(related_name, null=False):
+    return models.ForeignKey(
+        null=null,
+        on_delete=django.db.models.deletion.CASCADE,
+        related_name=related_name,
+        to='scoreboard.league',
+    )
+
+
+RELATED_NAMES = {
+    'member': 'members',
+    'scoreentry': 'entries',
+    'score': 'scores',
+    'headtohead': '+',
+    'standingssnapshot': '+',
+}
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scoreboard', '0004_standings_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='League',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('slug', models.SlugField(max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+    ] + [
+        migrations.AddField(
+            model_name=model_name,
+            name='league',
+            field=league_field(RELATED_NAMES[model_name], null=True),
+        )
+        for model_name in LEAGUE_MODELS
+    ] + [
+        migrations.RunPython(assign_default_league, migrations.RunPython.noop),
+    ] + [
+        migrations.AlterField(
+            model_name=model_name,
+            name='league',
+            field=league_field(RELATED_NAMES[model_name]),
+        )
+        for model_name in LEAGUE_MODELS
+    ] + [
+        migrations.RemoveIndex(
+            model_name='scoreentry',
+            name='scoreboard__date_1daf53_idx',
+        ),
+        migrations.AlterField(
+            model_name='member',
+            name='name',
+            field=models.CharField(max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='standingssnapshot',
+            name='date',
+            field=models.DateField(),
+        ),
+        migrations.AddIndex(
+            model_name='score',
+            index=models.Index(fields=['league', 'member'], name='scoreboard__league__c00c78_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scoreentry',
+            index=models.Index(fields=['league', 'date'], name='scoreboard__league__2b262a_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='headtohead',
+            unique_together={('league', 'member', 'opponent')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='member',
+            unique_together={('league', 'name')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='standingssnapshot',
+            unique_together={('league', 'date')},
+        ),
+    ]
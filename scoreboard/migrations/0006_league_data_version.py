@@ -0,0 +1,18 @@
+# Generated by Django 4.2.26 on 2026-10-19 02:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scoreboard', '0005_league'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='league',
+            name='data_version',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.26 on 2026-10-19 02:37
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scoreboard', '0006_league_data_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='league',
+            name='data_updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.26 on 2026-10-19 02:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scoreboard', '0007_league_data_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='scoreentry',
+            name='image',
+            field=models.ImageField(blank=True, upload_to='score_images/'),
+        ),
+    ]
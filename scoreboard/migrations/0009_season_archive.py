@@ -0,0 +1,72 @@
+# Generated by Django 4.2.26 on 2026-10-19 02:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scoreboard', '0008_scoreentry_image_optional'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Season',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('entry_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('closed_at', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('league', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seasons', to='scoreboard.league')),
+            ],
+            options={
+                'ordering': ['-end_date'],
+                'unique_together': {('league', 'name')},
+            },
+        ),
+        migrations.AddField(
+            model_name='scoreentry',
+            name='season',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.RESTRICT, related_name='entries', to='scoreboard.season'),
+        ),
+        migrations.CreateModel(
+            name='SeasonSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_score', models.IntegerField(default=0)),
+                ('rank_points', models.PositiveIntegerField(default=0)),
+                ('max_points', models.PositiveIntegerField(default=0)),
+                ('games', models.PositiveIntegerField(default=0)),
+                ('first', models.PositiveIntegerField(default=0)),
+                ('second', models.PositiveIntegerField(default=0)),
+                ('third', models.PositiveIntegerField(default=0)),
+                ('fourth', models.PositiveIntegerField(default=0)),
+                ('fifth', models.PositiveIntegerField(default=0)),
+                ('lost', models.PositiveIntegerField(default=0)),
+                ('league', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='scoreboard.league')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_summaries', to='scoreboard.member')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='summaries', to='scoreboard.season')),
+            ],
+            options={
+                'verbose_name_plural': 'Season summaries',
+                'unique_together': {('season', 'member')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.IntegerField(default=0)),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_scores', to='scoreboard.scoreentry')),
+                ('league', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='scoreboard.league')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_scores', to='scoreboard.member')),
+            ],
+            options={
+                'ordering': ['-score'],
+                'unique_together': {('entry', 'member')},
+            },
+        ),
+    ]
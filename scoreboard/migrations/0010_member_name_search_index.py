@@ -0,0 +1,33 @@
+# Generated by Django 4.2.26 on 2026-10-19 04:10
+
+from django.db import migrations
+
+
+# Member search filters on name__istartswith, which PostgreSQL runs as
+# UPPER(name) LIKE UPPER('prefix%'): only an UPPER(name) index with
+# pattern ops serves it under a non-C collation. SQLite gets its own
+# index in 0014.
+INDEX_NAME = 'scoreboard_member_name_prefix'
+
+
+def create_name_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE INDEX {INDEX_NAME} ON scoreboard_member (league_id, UPPER(name) varchar_pattern_ops)'
+        )
+
+
+def drop_name_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scoreboard', '0009_season_archive'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_name_prefix_index, drop_name_prefix_index),
+    ]
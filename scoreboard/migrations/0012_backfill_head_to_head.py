@@ -0,0 +1,57 @@
+# Generated by Django 4.2.26 on 2026-10-19 03:20
+
+from collections import defaultdict
+from itertools import combinations, groupby
+
+from django.db import migrations
+
+
+def backfill_head_to_head(apps, schema_editor):
+    """
+    Fills the head-to-head table from the existing games, as
+    stats.rebuild_head_to_head() does: without it, the matrix of a database
+    that had games before 0003 only counts the games entered since.
+    """
+    League = apps.get_model('scoreboard', 'League')
+    HeadToHead = apps.get_model('scoreboard', 'HeadToHead')
+    score_models = [apps.get_model('scoreboard', 'ArchivedScore'), apps.get_model('scoreboard', 'Score')]
+
+    for league_id in League.objects.values_list('pk', flat=True):
+        deltas = defaultdict(lambda: [0, 0, 0, 0])
+        for model in score_models:
+            rows = (
+                model.objects.filter(league_id=league_id).exclude(score=0)
+                .order_by('entry_id', 'member_id').values_list('entry_id', 'member_id', 'score')
+                .iterator(chunk_size=5000)
+            )
+            for _, game in groupby(rows, key=lambda row: row[0]):
+                played = [(member_id, score) for _, member_id, score in game]
+                for (a_id, a_score), (b_id, b_score) in combinations(played, 2):
+                    record = deltas[(a_id, b_id)]
+                    if a_score > b_score:
+                        record[0] += 1
+                    elif a_score < b_score:
+                        record[1] += 1
+                    else:
+                        record[2] += 1
+                    record[3] += 1
+
+        HeadToHead.objects.filter(league_id=league_id).delete()
+        HeadToHead.objects.bulk_create(
+            [
+                HeadToHead(league_id=league_id, member_id=a, opponent_id=b, wins=w, losses=l, draws=d, games=g)
+                for (a, b), (w, l, d, g) in deltas.items()
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scoreboard', '0011_request_profile'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_head_to_head, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.26 on 2026-10-19 03:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def add_users_to_leagues(apps, schema_editor):
+    """Every existing user keeps the access they had: all leagues."""
+    League = apps.get_model('scoreboard', 'League')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    Through = League.users.through
+    user_ids = list(User.objects.values_list('pk', flat=True))
+    for league_id in League.objects.values_list('pk', flat=True):
+        Through.objects.bulk_create(
+            [Through(league_id=league_id, user_id=user_id) for user_id in user_ids],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('scoreboard', '0012_backfill_head_to_head'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='league',
+            name='users',
+            field=models.ManyToManyField(blank=True, related_name='leagues', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(add_users_to_leagues, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.26 on 2026-10-19 05:10
+
+from django.db import migrations
+
+
+# SQLite runs name__istartswith as a case-insensitive LIKE, which can only
+# use an index on the column with the NOCASE collation: the (league, name)
+# unique index (BINARY) serves league_id alone. PostgreSQL has its own
+# prefix index from 0010.
+INDEX_NAME = 'scoreboard_member_name_nocase'
+
+
+def create_name_nocase_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE INDEX {INDEX_NAME} ON scoreboard_member (league_id, name COLLATE NOCASE)'
+        )
+
+
+def drop_name_nocase_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scoreboard', '0013_league_users'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_name_nocase_index, drop_name_nocase_index),
+    ]
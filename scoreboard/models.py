@@ -2,33 +2,71 @@
 # FILE: scoreboard/models.py
 # ============================================
 
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 
-class Member(models.Model):
+class League(models.Model):
     name = models.CharField(max_length=100, unique=True)
+    slug = models.SlugField(max_length=100, unique=True)
+    # Bumped on every member/entry/score write; keys cached fragments and ETags
+    data_version = models.PositiveBigIntegerField(default=0, editable=False)
+    data_updated_at = models.DateTimeField(default=timezone.now, editable=False)
+    # Who may open the league (leagues.user_leagues); superusers open every league
+    users = models.ManyToManyField(User, related_name='leagues', blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+class Member(models.Model):
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='members')
+    name = models.CharField(max_length=100)
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         ordering = ['name']
+        # Member search (case-insensitive prefix) has its own indexes:
+        # UPPER(name) on PostgreSQL (migration 0010), NOCASE on SQLite (0014)
+        unique_together = ('league', 'name')
     
     def __str__(self):
         return self.name
 
 class ScoreEntry(models.Model):
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='entries')
     date = models.DateField()
-    image = models.ImageField(upload_to='score_images/')
+    image = models.ImageField(upload_to='score_images/', blank=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the entry's season is closed and its scores moved to ArchivedScore
+    season = models.ForeignKey('Season', on_delete=models.RESTRICT, null=True, blank=True, editable=False, related_name='entries')
     
     class Meta:
         ordering = ['-date', '-created_at']
         verbose_name_plural = "Score Entries"
+        indexes = [models.Index(fields=['league', 'date'])]
     
     def __str__(self):
         return f"Scores for {self.date}"
 
+    @property
+    def results(self):
+        """This game's score rows: live, or archived once its season is closed."""
+        return self.archived_scores if self.season_id else self.scores
+
+    def clean(self):
+        if self.season_id is None and self.league_id and self.date:
+            archived_until = Season.archived_until(self.league_id)
+            if archived_until and self.date <= archived_until:
+                raise ValidationError({'date': f"Games up to {archived_until} belong to closed seasons."})
+
 class Score(models.Model):
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='scores')
     entry = models.ForeignKey(ScoreEntry, on_delete=models.CASCADE, related_name='scores')
     member = models.ForeignKey(Member, on_delete=models.CASCADE,related_name="scores")
     score = models.IntegerField(default=0)
@@ -36,6 +74,157 @@ class Score(models.Model):
     class Meta:
         unique_together = ('entry', 'member')
         ordering = ['-score']
+        indexes = [models.Index(fields=['league', 'member'])]
     
     def __str__(self):
         return f"{self.member.name}: {self.score}"
+
+    def clean(self):
+        if self.entry_id and ScoreEntry.objects.filter(pk=self.entry_id, season__isnull=False).exists():
+            raise ValidationError({'entry': "This game belongs to a closed season."})
+        # The admin inline sets an unsaved entry when the game is added with its scores
+        entry = self.entry if self.entry_id or Score.entry.is_cached(self) else None
+        if entry is not None and self.member_id and self.member.league_id != entry.league_id:
+            raise ValidationError({'member': f"{self.member.name} is not a member of this game's league."})
+
+class HeadToHead(models.Model):
+    """
+    Running pairwise record for two members, stored once per pair
+    (member.id < opponent.id). Wins/losses are from `member`'s side.
+    """
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='+')
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='head_to_head')
+    opponent = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='+')
+    wins = models.PositiveIntegerField(default=0)
+    losses = models.PositiveIntegerField(default=0)
+    draws = models.PositiveIntegerField(default=0)
+    games = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('league', 'member', 'opponent')
+        constraints = [
+            models.CheckConstraint(check=models.Q(member__lt=models.F('opponent')), name='head_to_head_ordered_pair'),
+        ]
+        verbose_name_plural = "Head to Head"
+
+    def __str__(self):
+        return f"{self.member} vs {self.opponent}: {self.wins}-{self.losses}"
+
+class StandingsSnapshot(models.Model):
+    """
+    Cumulative per-member aggregates for every entry dated on or before `date`.
+    `standings` maps member id -> list of values in stats.AGGREGATE_FIELDS order.
+    """
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='+')
+    date = models.DateField()
+    entry_count = models.PositiveIntegerField(default=0)
+    standings = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-date']
+        unique_together = ('league', 'date')
+
+    def __str__(self):
+        return f"{self.league} standings as of {self.date}"
+
+class Season(models.Model):
+    """
+    A league season. Closing it (seasons.close_season) rolls every live game
+    dated on or before `end_date` into SeasonSummary rows and moves the raw
+    scores to ArchivedScore, keeping the live Score table small.
+    """
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='seasons')
+    name = models.CharField(max_length=100)
+    start_date = models.DateField()
+    end_date = models.DateField()
+    entry_count = models.PositiveIntegerField(default=0, editable=False)
+    closed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        ordering = ['-end_date']
+        unique_together = ('league', 'name')
+
+    def __str__(self):
+        return f"{self.league} {self.name}"
+
+    @property
+    def is_closed(self):
+        return self.closed_at is not None
+
+    @classmethod
+    def archived_until(cls, league_id):
+        """End of the league's last closed season (every game up to it is archived), or None."""
+        return (
+            cls.objects.filter(league_id=league_id, closed_at__isnull=False)
+            .aggregate(end=models.Max('end_date'))['end']
+        )
+
+    def clean(self):
+        if self.start_date and self.end_date and self.start_date > self.end_date:
+            raise ValidationError({'end_date': "A season cannot end before it starts."})
+
+class SeasonSummary(models.Model):
+    """Per-member aggregates (stats.AGGREGATE_FIELDS) over a closed season's games."""
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='+')
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name='summaries')
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='season_summaries')
+    total_score = models.IntegerField(default=0)
+    rank_points = models.PositiveIntegerField(default=0)
+    max_points = models.PositiveIntegerField(default=0)
+    games = models.PositiveIntegerField(default=0)
+    first = models.PositiveIntegerField(default=0)
+    second = models.PositiveIntegerField(default=0)
+    third = models.PositiveIntegerField(default=0)
+    fourth = models.PositiveIntegerField(default=0)
+    fifth = models.PositiveIntegerField(default=0)
+    lost = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('season', 'member')
+        verbose_name_plural = "Season summaries"
+
+    def __str__(self):
+        return f"{self.member} in {self.season}"
+
+class ArchivedScore(models.Model):
+    """Score rows of closed seasons, read only for game details, history and full rebuilds."""
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='+')
+    entry = models.ForeignKey(ScoreEntry, on_delete=models.CASCADE, related_name='archived_scores')
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='archived_scores')
+    score = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('entry', 'member')
+        ordering = ['-score']
+
+    def __str__(self):
+        return f"{self.member.name}: {self.score}"
+
+class RequestProfile(models.Model):
+    """One request profiled on demand by a staff user (see profiling.py)."""
+    MODE_CHOICES = [('sample', 'Stack sampler'), ('cprofile', 'cProfile')]
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    status_code = models.PositiveSmallIntegerField()
+    mode = models.CharField(max_length=10, choices=MODE_CHOICES)
+    duration_ms = models.FloatField()
+    sql_count = models.PositiveIntegerField(default=0)
+    sql_ms = models.FloatField(default=0)
+    # [{"alias", "sql", "ms", "many"}] in execution order, parameters left out
+    queries = models.JSONField(default=list)
+    # Text report: pstats (cprofile) or frames by samples (sample)
+    stats = models.TextField(blank=True)
+    # Collapsed stacks for flamegraph.pl / speedscope (sample mode)
+    stacks = models.TextField(blank=True)
+    # Marshalled pstats data, i.e. a .prof file (cprofile mode)
+    profile_data = models.BinaryField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
@@ -0,0 +1,190 @@
+# ============================================
+# FILE: scoreboard/profiling.py
+# ============================================
+#
+# On-demand profiling of single requests in place (production included):
+# staff add ?profile=sample|cprofile or an X-Profile header, and
+# RequestProfilingMiddleware stores a RequestProfile with the flamegraph-ready
+# output and SQL timings. Browse them under the admin's "Request profiles".
+
+import cProfile
+import functools
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .models import RequestProfile
+
+MODES = ('sample', 'cprofile')
+# Between stack samples; the sampler thread also waits for the GIL, so the
+# effective rate is bounded by sys.getswitchinterval() (5 ms by default)
+SAMPLE_INTERVAL = 0.001
+# Queries stored per profile (all are counted and timed)
+MAX_QUERIES = 500
+STATS_LINES = 60
+
+
+def requested_mode(request):
+    """'sample', 'cprofile' or None from ?profile= / the X-Profile header ("1" means sample)."""
+    value = (request.GET.get('profile') or request.headers.get('X-Profile') or '').strip().lower()
+    if not value or value in ('0', 'false', 'no'):
+        return None
+    return value if value in MODES else 'sample'
+
+
+@functools.lru_cache(maxsize=None)
+def _short_path(filename):
+    """The file relative to the longest sys.path entry containing it."""
+    for root in sorted(filter(None, sys.path), key=len, reverse=True):
+        if filename.startswith(root + os.sep):
+            return filename[len(root) + 1:]
+    return filename
+
+
+def _frame_name(code):
+    # co_qualname (Class.method) is new in Python 3.11
+    name = getattr(code, 'co_qualname', code.co_name)
+    return f"{name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Records the Python stack of one thread every `interval` seconds from a
+    background thread, up to (not including) `root_frame`. Output is in the
+    collapsed "root;...;leaf count" format read by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, root_frame, interval=SAMPLE_INTERVAL):
+        self.thread_id = threading.get_ident()
+        self.root_frame = root_frame
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame is not self.root_frame:
+                stack.append(_frame_name(frame.f_code))
+                frame = frame.f_back
+            # A sample taken while stop() runs shows the profiler, not the request
+            if stack and not self._stop.is_set():
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def collapsed(self):
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+    def report(self, lines=STATS_LINES):
+        """Frames by self and total samples, like pstats' tottime/cumtime columns."""
+        total = sum(self.samples.values())
+        if not total:
+            return "No samples: the request finished within one sample interval."
+        own, inclusive = Counter(), Counter()
+        for stack, count in self.samples.items():
+            frames = stack.split(';')
+            own[frames[-1]] += count
+            for frame in set(frames):
+                inclusive[frame] += count
+
+        out = [f"{total} samples every {self.interval * 1000:g} ms", "", "   self   total  frame"]
+        for frame, count in own.most_common(lines):
+            out.append(f"{count / total:7.1%} {inclusive[frame] / total:7.1%}  {frame}")
+        return "\n".join(out)
+
+
+class QueryTimer:
+    """execute_wrapper recording each query's SQL (without parameters) and duration."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'alias': context['connection'].alias,
+                'sql': sql,
+                'ms': round((time.perf_counter() - start) * 1000, 3),
+                'many': many,
+            })
+
+    def total_ms(self):
+        return sum(q['ms'] for q in self.queries)
+
+
+def profile_request(request, get_response, mode, user_id=None):
+    """Runs get_response(request) under the profiler for `mode`; returns (response, RequestProfile)."""
+    timer = QueryTimer()
+    profiler = sampler = None
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(timer))
+
+        start = time.perf_counter()
+        if mode == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            sampler = StackSampler(sys._getframe())
+            sampler.start()
+        try:
+            response = get_response(request)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            else:
+                sampler.stop()
+        duration = time.perf_counter() - start
+
+    profile = RequestProfile(
+        user_id=user_id,
+        method=request.method,
+        path=request.get_full_path()[:500],
+        status_code=response.status_code,
+        mode=mode,
+        duration_ms=round(duration * 1000, 3),
+        sql_count=len(timer.queries),
+        sql_ms=round(timer.total_ms(), 3),
+        queries=timer.queries[:MAX_QUERIES],
+    )
+    if profiler is not None:
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(STATS_LINES)
+        profile.stats = out.getvalue()
+        # Same bytes as Profile.dump_stats(): a .prof file for snakeviz, flameprof, ...
+        profiler.create_stats()
+        profile.profile_data = marshal.dumps(profiler.stats)
+    else:
+        profile.stats = sampler.report()
+        profile.stacks = sampler.collapsed()
+    save_profile(profile)
+    return response, profile
+
+
+def save_profile(profile):
+    """Saves the profile and deletes all but the newest settings.REQUEST_PROFILE_KEEP."""
+    profile.save()
+    keep = getattr(settings, 'REQUEST_PROFILE_KEEP', 50)
+    stale = list(RequestProfile.objects.order_by('-created_at', '-pk').values_list('pk', flat=True)[keep:])
+    if stale:
+        RequestProfile.objects.filter(pk__in=stale).delete()
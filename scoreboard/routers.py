@@ -0,0 +1,39 @@
+# ============================================
+# FILE: scoreboard/routers.py
+# ============================================
+
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Set by PrimaryPinningMiddleware for requests that must see the primary's data
+use_primary = ContextVar('use_primary', default=False)
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends reads to a random database in settings.DATABASE_REPLICAS and all
+    writes to the primary. Reads stay on the primary while the request (or
+    the client, via the pin cookie) has recently written, and inside
+    transactions on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = getattr(settings, 'DATABASE_REPLICAS', [])
+        if not replicas or use_primary.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        # Read-your-writes for the rest of this request
+        use_primary.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
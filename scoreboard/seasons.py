@@ -0,0 +1,56 @@
+# ============================================
+# FILE: scoreboard/seasons.py
+# ============================================
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import bump_data_version
+from .models import ArchivedScore, Score, ScoreEntry, Season, SeasonSummary
+from .stats import season_summaries
+
+ARCHIVE_BATCH_SIZE = 5000
+
+
+def close_season(season):
+    """
+    Rolls every live game of the season's league dated on or before its
+    end_date (including any no earlier season covered) into SeasonSummary
+    rows, and moves their scores from Score to ArchivedScore. Standings,
+    snapshots and head-to-head need no recomputation: totals are unchanged.
+    """
+    if season.is_closed:
+        raise ValidationError(f"{season} is already closed.")
+    if season.end_date >= timezone.localdate():
+        raise ValidationError(f"{season} has not ended yet.")
+    if Season.objects.filter(league_id=season.league_id, closed_at__isnull=True, end_date__lt=season.end_date).exists():
+        raise ValidationError(f"Close the seasons of {season.league} that end before {season.name} first.")
+
+    with transaction.atomic():
+        entries = ScoreEntry.objects.filter(league_id=season.league_id, season__isnull=True, date__lte=season.end_date)
+        scores = Score.objects.filter(entry__in=entries)
+
+        summaries, entry_count = season_summaries(season, scores)
+        SeasonSummary.objects.bulk_create(summaries, batch_size=1000)
+
+        archived_ids, batch = [], []
+        for pk, entry_id, member_id, score in scores.values_list('pk', 'entry_id', 'member_id', 'score').iterator(chunk_size=ARCHIVE_BATCH_SIZE):
+            archived_ids.append(pk)
+            batch.append(ArchivedScore(league_id=season.league_id, entry_id=entry_id, member_id=member_id, score=score))
+            if len(batch) == ARCHIVE_BATCH_SIZE:
+                ArchivedScore.objects.bulk_create(batch)
+                batch = []
+        ArchivedScore.objects.bulk_create(batch)
+
+        # Exactly the rows archived above, in chunks to bound the IN list
+        for start in range(0, len(archived_ids), ARCHIVE_BATCH_SIZE):
+            Score.objects.filter(pk__in=archived_ids[start:start + ARCHIVE_BATCH_SIZE]).delete()
+        entries.update(season=season)
+
+        season.entry_count = entry_count
+        season.closed_at = timezone.now()
+        season.save(update_fields=['entry_count', 'closed_at'])
+        bump_data_version(season.league_id)
+
+    return season
@@ -0,0 +1,41 @@
+# ============================================
+# FILE: scoreboard/signals.py
+# ============================================
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_all_data_versions, bump_data_version, forget_user
+from .models import League, Member, ScoreEntry
+
+
+@receiver(post_save, sender=Member)
+@receiver(post_delete, sender=Member)
+@receiver(post_save, sender=ScoreEntry)
+@receiver(post_delete, sender=ScoreEntry)
+def league_data_changed(sender, instance, **kwargs):
+    # Not for Score: every path writing scores bumps once through the
+    # stats maintenance hooks, and a receiver would stop cascades from
+    # deleting them in bulk
+    bump_data_version(instance.league_id)
+
+
+@receiver(post_save, sender=League)
+@receiver(post_delete, sender=League)
+def league_changed(sender, instance, **kwargs):
+    # Every page lists the viewer's leagues in the navigation
+    bump_all_data_versions()
+
+
+@receiver(m2m_changed, sender=League.users.through)
+def league_users_changed(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_all_data_versions()
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def user_changed(sender, instance, **kwargs):
+    # Password, is_active and is_staff changes must reach cached request.user
+    forget_user(instance.pk)
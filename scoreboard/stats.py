@@ -0,0 +1,424 @@
+# ============================================
+# FILE: scoreboard/stats.py
+# ============================================
+
+import datetime
+from collections import defaultdict
+from itertools import chain, combinations
+
+from django.db import transaction
+from django.db.models import Min, Sum
+from django.utils import timezone
+
+from .cache import bump_data_version
+from .models import ArchivedScore, HeadToHead, Score, Season, SeasonSummary, StandingsSnapshot
+
+AGGREGATE_FIELDS = (
+    'total_score', 'rank_points', 'max_points', 'games',
+    'first', 'second', 'third', 'fourth', 'fifth', 'lost',
+)
+PLACEMENTS = ('first', 'second', 'third', 'fourth', 'fifth')
+
+
+# ============================================
+# Score rows
+# ============================================
+
+def score_rows(scores=None):
+    """
+    (entry_id, date, member_id, score) rows ordered by game date, then entry.
+    """
+    if scores is None:
+        scores = Score.objects.all()
+    return (
+        scores.order_by('entry__date', 'entry_id')
+        .values_list('entry_id', 'entry__date', 'member_id', 'score')
+        .iterator(chunk_size=5000)
+    )
+
+
+def league_score_rows(league, after=None, until=None, played_only=False):
+    """
+    score_rows() for the league's games dated after `after` and on or before
+    `until`, live or archived. Closed seasons archive every game up to their
+    end, so archived rows all come first and the two tables are just chained.
+    """
+    sources = [Score.objects.filter(entry__league=league)]
+    archived_until = Season.archived_until(league.id)
+    if archived_until is not None and (after is None or after < archived_until):
+        sources.insert(0, ArchivedScore.objects.filter(entry__league=league))
+
+    rows = []
+    for scores in sources:
+        if after is not None:
+            scores = scores.filter(entry__date__gt=after)
+        if until is not None:
+            scores = scores.filter(entry__date__lte=until)
+        if played_only:
+            scores = scores.exclude(score=0)
+        rows.append(score_rows(scores))
+    return chain(*rows)
+
+
+def iter_games(rows):
+    """
+    Groups score rows ordered by entry into (date, [(member_id, score), ...]).
+    Zero rows (members who did not attend) are kept.
+    """
+    current_entry = None
+    date = None
+    game = []
+    for entry_id, entry_date, member_id, score in rows:
+        if entry_id != current_entry:
+            if game:
+                yield date, game
+            current_entry = entry_id
+            date = entry_date
+            game = []
+        game.append((member_id, score))
+    if game:
+        yield date, game
+
+
+# ============================================
+# Per-member standings
+# ============================================
+
+def new_standings():
+    return defaultdict(lambda: dict.fromkeys(AGGREGATE_FIELDS, 0))
+
+
+def accumulate_game(standings, game):
+    """
+    Adds one game to the running standings. Positions count every row in the
+    entry (zeros included); members with a zero score did not play.
+    """
+    sorted_scores = sorted(game, key=lambda s: s[1], reverse=True)
+    total_members_in_game = len(sorted_scores)
+
+    for position, (member_id, score) in enumerate(sorted_scores, start=1):
+        stats = standings[member_id]
+        stats['total_score'] += score
+
+        if score == 0:
+            continue
+
+        stats['rank_points'] += total_members_in_game - position + 1
+        stats['max_points'] += total_members_in_game
+        stats['games'] += 1
+
+        if score < 0:
+            stats['lost'] += 1
+        elif position <= len(PLACEMENTS):
+            stats[PLACEMENTS[position - 1]] += 1
+
+
+def win_rate(stats):
+    if stats['max_points'] == 0:
+        return 0
+    return (stats['rank_points'] / stats['max_points']) * 100
+
+
+# ============================================
+# Standings snapshots
+# ============================================
+
+def snapshot_date(date):
+    """The snapshot a game belongs to: the Sunday closing its week."""
+    return date + datetime.timedelta(days=6 - date.weekday())
+
+
+def _pack(standings):
+    return {str(member_id): [stats[f] for f in AGGREGATE_FIELDS] for member_id, stats in standings.items()}
+
+
+def _unpack(data):
+    standings = new_standings()
+    for member_id, values in data.items():
+        standings[int(member_id)] = dict(zip(AGGREGATE_FIELDS, values))
+    return standings
+
+
+def _replay(standings, entry_count, rows, until=None):
+    """
+    Replays games into `standings`, yielding (week_end, entry_count) each
+    time a completed week closes. Weeks ending on/after `until` stay open.
+    """
+    week_end = None
+    for date, game in iter_games(rows):
+        game_week = snapshot_date(date)
+        if week_end is not None and game_week != week_end and (until is None or week_end < until):
+            yield week_end, entry_count
+        week_end = game_week
+        accumulate_game(standings, game)
+        entry_count += 1
+    if week_end is not None and (until is None or week_end < until):
+        yield week_end, entry_count
+
+
+def season_standings(league, until):
+    """
+    Aggregates of the league's closed seasons ending on or before `until`,
+    summed from their SeasonSummary rows, and the number of games they cover.
+    """
+    standings = new_standings()
+    summaries = (
+        SeasonSummary.objects.filter(league=league, season__end_date__lte=until)
+        .values('member_id').annotate(**{f'{f}_sum': Sum(f) for f in AGGREGATE_FIELDS})
+    )
+    for row in summaries:
+        standings[row['member_id']] = {f: row[f'{f}_sum'] for f in AGGREGATE_FIELDS}
+    entry_count = (
+        Season.objects.filter(league=league, closed_at__isnull=False, end_date__lte=until)
+        .aggregate(total=Sum('entry_count'))['total']
+    )
+    return standings, entry_count or 0
+
+
+def season_summaries(season, scores):
+    """
+    Unsaved SeasonSummary rows for the season from its games' `scores`, and
+    the number of games.
+    """
+    standings = new_standings()
+    entry_count = 0
+    for _, game in iter_games(score_rows(scores)):
+        accumulate_game(standings, game)
+        entry_count += 1
+    summaries = [
+        SeasonSummary(league_id=season.league_id, season=season, member_id=member_id, **stats)
+        for member_id, stats in standings.items()
+        if any(stats[f] for f in AGGREGATE_FIELDS)
+    ]
+    return summaries, entry_count
+
+
+def rebuild_season_summaries(league, since):
+    """
+    Recomputes the summaries of the league's closed seasons with games dated
+    on or after `since` from their archived scores.
+    """
+    for season in Season.objects.filter(league=league, closed_at__isnull=False, end_date__gte=since):
+        summaries, _ = season_summaries(season, ArchivedScore.objects.filter(entry__season=season))
+        with transaction.atomic():
+            SeasonSummary.objects.filter(season=season).delete()
+            SeasonSummary.objects.bulk_create(summaries, batch_size=1000)
+
+
+def _starting_point(league, date=None):
+    """
+    (standings, entry_count, as_of) to replay the league's later games onto:
+    the latest snapshot or the closed season summaries, whichever reaches
+    further (without passing `date`); empty standings when there is neither.
+    """
+    snapshots = StandingsSnapshot.objects.filter(league=league).order_by('-date')
+    seasons = Season.objects.filter(league=league, closed_at__isnull=False).order_by('-end_date')
+    if date is not None:
+        snapshots = snapshots.filter(date__lte=date)
+        seasons = seasons.filter(end_date__lte=date)
+
+    snapshot = snapshots.first()
+    season = seasons.first()
+    if season and (snapshot is None or season.end_date > snapshot.date):
+        standings, entry_count = season_standings(league, season.end_date)
+        return standings, entry_count, season.end_date
+    if snapshot:
+        return _unpack(snapshot.standings), snapshot.entry_count, snapshot.date
+    return new_standings(), 0, None
+
+
+def refresh_snapshots(league):
+    """
+    Creates snapshots for every completed week after the league's latest
+    valid one (or closed season), replaying only the games since then.
+    """
+    standings, entry_count, start = _starting_point(league)
+    rows = league_score_rows(league, after=start)
+
+    snapshots = [
+        StandingsSnapshot(league=league, date=week_end, entry_count=count, standings=_pack(standings))
+        for week_end, count in _replay(standings, entry_count, rows, until=timezone.localdate())
+    ]
+    StandingsSnapshot.objects.bulk_create(snapshots, batch_size=100, ignore_conflicts=True)
+
+
+def invalidate_snapshots(league, since):
+    """Drops the league's snapshots that include games dated on or after `since`."""
+    StandingsSnapshot.objects.filter(league=league, date__gte=since).delete()
+
+
+def rebuild_snapshots(league):
+    """Recomputes the league's snapshots; those of closed seasons (archived games) are kept."""
+    snapshots = StandingsSnapshot.objects.filter(league=league)
+    archived_until = Season.archived_until(league.id)
+    if archived_until is not None:
+        snapshots = snapshots.filter(date__gt=archived_until)
+
+    with transaction.atomic():
+        snapshots.delete()
+        refresh_snapshots(league)
+
+
+def standings_as_of(league, date=None):
+    """
+    Per-member aggregates over the league's games dated on or before `date`
+    (default: every game): the latest snapshot or closed season summaries,
+    plus a replay of the games after them.
+    """
+    standings, _, start = _starting_point(league, date)
+    for _, game in iter_games(league_score_rows(league, after=start, until=date)):
+        accumulate_game(standings, game)
+    return standings
+
+
+# ============================================
+# Head to head
+# ============================================
+
+def head_to_head_deltas(games, deltas=None):
+    """
+    Accumulates pairwise results for the given games into
+    {(low_id, high_id): [wins, losses, draws, games]} from low_id's side.
+    """
+    if deltas is None:
+        deltas = defaultdict(lambda: [0, 0, 0, 0])
+
+    for _, game in games:
+        played = sorted(s for s in game if s[1] != 0)
+        for (a_id, a_score), (b_id, b_score) in combinations(played, 2):
+            record = deltas[(a_id, b_id)]
+            if a_score > b_score:
+                record[0] += 1
+            elif a_score < b_score:
+                record[1] += 1
+            else:
+                record[2] += 1
+            record[3] += 1
+
+    return deltas
+
+
+def rebuild_head_to_head(league):
+    """
+    Recomputes the league's head-to-head table in a single pass over its
+    scores, archived seasons included.
+    """
+    deltas = head_to_head_deltas(iter_games(league_score_rows(league, played_only=True)))
+
+    with transaction.atomic():
+        HeadToHead.objects.filter(league=league).delete()
+        HeadToHead.objects.bulk_create(
+            [
+                HeadToHead(league=league, member_id=a, opponent_id=b, wins=w, losses=l, draws=d, games=g)
+                for (a, b), (w, l, d, g) in deltas.items()
+            ],
+            batch_size=1000,
+        )
+
+
+def record_head_to_head(league, entries):
+    """
+    Incrementally adds the given (already saved) entries to the league's head-to-head table.
+    """
+    scores = Score.objects.filter(league=league, entry__in=entries).exclude(score=0)
+    deltas = head_to_head_deltas(iter_games(score_rows(scores)))
+    if not deltas:
+        return
+
+    member_ids = {member_id for pair in deltas for member_id in pair}
+
+    with transaction.atomic():
+        existing = {
+            (h.member_id, h.opponent_id): h
+            for h in HeadToHead.objects.select_for_update().filter(
+                league=league, member_id__in=member_ids, opponent_id__in=member_ids
+            )
+        }
+        to_update, to_create = [], []
+        for (a, b), (w, l, d, g) in deltas.items():
+            h = existing.get((a, b))
+            if h is None:
+                to_create.append(HeadToHead(league=league, member_id=a, opponent_id=b, wins=w, losses=l, draws=d, games=g))
+                continue
+            h.wins += w
+            h.losses += l
+            h.draws += d
+            h.games += g
+            to_update.append(h)
+
+        HeadToHead.objects.bulk_update(to_update, ['wins', 'losses', 'draws', 'games'])
+        HeadToHead.objects.bulk_create(to_create)
+
+
+def head_to_head_matrix(league, members):
+    """
+    Returns one row per member with a cell for every member in `members`
+    (None on the diagonal), each cell seen from the row member's side.
+    """
+    members = list(members)
+    member_ids = set(m.id for m in members)
+
+    records = {}
+    for h in HeadToHead.objects.filter(league=league):
+        if h.member_id not in member_ids or h.opponent_id not in member_ids:
+            continue
+        records[(h.member_id, h.opponent_id)] = {
+            "wins": h.wins, "losses": h.losses, "draws": h.draws, "games": h.games,
+        }
+        records[(h.opponent_id, h.member_id)] = {
+            "wins": h.losses, "losses": h.wins, "draws": h.draws, "games": h.games,
+        }
+
+    empty = {"wins": 0, "losses": 0, "draws": 0, "games": 0}
+    return [
+        {
+            "member": row,
+            "cells": [
+                None if row.id == col.id else records.get((row.id, col.id), empty)
+                for col in members
+            ],
+        }
+        for row in members
+    ]
+
+
+# ============================================
+# Maintenance hooks
+# ============================================
+
+def entries_added(league, entries):
+    """Updates the league's derived stats after new entries (and their scores) are saved."""
+    record_head_to_head(league, entries)
+    invalidate_snapshots(league, min(entry.date for entry in entries))
+    refresh_snapshots(league)
+    bump_data_version(league.id)
+
+
+def members_first_games(members):
+    """
+    {league_id: date of the earliest game} over the given members' score rows,
+    live or archived. Read before deleting members: their rows (zeros too)
+    count towards every other player's position in those games.
+    """
+    since = {}
+    for model in (Score, ArchivedScore):
+        rows = (
+            model.objects.filter(member__in=members).order_by()
+            .values('league_id').annotate(since=Min('entry__date')).values_list('league_id', 'since')
+        )
+        for league_id, date in rows:
+            since[league_id] = min(date, since.get(league_id, date))
+    return since
+
+
+def entries_changed(league, since):
+    """
+    Resyncs the league's derived stats after entries dated `since` or later
+    were edited or deleted. Archived games only change when members (and
+    their archived scores) are deleted.
+    """
+    rebuild_season_summaries(league, since)
+    rebuild_head_to_head(league)
+    invalidate_snapshots(league, since)
+    refresh_snapshots(league)
+    bump_data_version(league.id)
@@ -0,0 +1,51 @@
+# ============================================
+# FILE: scoreboard/storage.py
+# ============================================
+
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip variants are written without it
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.html', '.map')
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Hashed static files (safe to serve with far-future expiry) plus
+    precompressed .gz and, when brotli is installed, .br variants written
+    next to each text file during collectstatic.
+    """
+    min_compress_size = 256
+
+    def post_process(self, paths, dry_run=False, **options):
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if not dry_run and not isinstance(processed, Exception) and hashed_name:
+                self._write_compressed(name)
+                self._write_compressed(hashed_name)
+            yield name, hashed_name, processed
+
+    def _write_compressed(self, name):
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS) or not self.exists(name):
+            return
+
+        with self.open(name) as f:
+            content = f.read()
+        if len(content) < self.min_compress_size:
+            return
+
+        variants = [('.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(content)))
+
+        for suffix, compressed in variants:
+            if len(compressed) >= len(content):
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
@@ -1,3 +1,535 @@
-from django.test import TestCase
+import datetime
+import random
+from unittest import skipUnless
+from urllib.parse import urlsplit
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from .cache import user_cache_key
+from .entries import create_entries, parse_games_csv, recent_members, search_members, validate_games
+from .loadtest import Stats
+from .middleware import PRIMARY_PIN_COOKIE, PrimaryPinningMiddleware
+from .models import HeadToHead, League, Member, RequestProfile, Score, ScoreEntry, Season, StandingsSnapshot
+from .routers import PrimaryReplicaRouter, use_primary
+from .seasons import close_season
+from .stats import (
+    accumulate_game, entries_changed, iter_games, league_score_rows, new_standings,
+    rebuild_head_to_head, standings_as_of,
+)
+
+
+def replayed_standings(league, date=None):
+    """Standings from a full replay of every game up to `date`, live or archived."""
+    standings = new_standings()
+    for _, game in iter_games(league_score_rows(league, until=date)):
+        accumulate_game(standings, game)
+    return standings
+
+
+# Pages are rendered without running collectstatic first
+@override_settings(STORAGES={
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+})
+class LeagueTestCase(TestCase):
+    """The default league with 6 members and 30 past games, every other day."""
+
+    games = 30
+
+    def setUp(self):
+        cache.clear()
+        self.league, _ = League.objects.get_or_create(slug='default', defaults={'name': 'Default'})
+        self.admin = User.objects.create_superuser('admin', password='pw')
+        self.members = [Member.objects.create(league=self.league, name=f"Member {i}") for i in range(6)]
+        self.start = timezone.localdate() - datetime.timedelta(days=2 * self.games + 10)
+        self.add_games(self.games, self.start)
+
+    def add_games(self, count, start, seed=0):
+        rng = random.Random(seed)
+        games = [
+            {
+                "date": start + datetime.timedelta(days=2 * n),
+                "image": None,
+                # Few distinct values, so some games have ties
+                "scores": {m.id: rng.choice([-20, -5, 10, 10, 30, 45]) for m in rng.sample(self.members, rng.randint(4, 6))},
+            }
+            for n in range(count)
+        ]
+        return create_entries(self.league, self.admin, games)
+
+    def game_dates(self):
+        return sorted(set(self.league.entries.values_list('date', flat=True)))
+
+    def head_to_head(self):
+        return sorted(
+            HeadToHead.objects.filter(league=self.league)
+            .values_list('member_id', 'opponent_id', 'wins', 'losses', 'draws', 'games')
+        )
+
+    def assertHeadToHeadMatchesRebuild(self):
+        incremental = self.head_to_head()
+        rebuild_head_to_head(self.league)
+        self.assertEqual(incremental, self.head_to_head())
+
+    def assertStandingsMatchReplay(self, dates=None):
+        for date in [None] + list(dates if dates is not None else self.game_dates()):
+            expected = {k: v for k, v in replayed_standings(self.league, date).items() if any(v.values())}
+            actual = {k: v for k, v in standings_as_of(self.league, date).items() if any(v.values())}
+            self.assertEqual(actual, expected, f"standings as of {date}")
+
+
+class MemberDeletionTests(LeagueTestCase):
+
+    def test_delete_view_resyncs_standings(self):
+        self.assertTrue(StandingsSnapshot.objects.filter(league=self.league).exists())
+        self.client.force_login(self.admin)
+        response = self.client.post(reverse('member_delete', args=[self.members[0].pk]))
+        self.assertRedirects(response, reverse('member_list'))
+        self.assertStandingsMatchReplay()
+
+    def test_admin_delete_resyncs_standings(self):
+        self.client.force_login(self.admin)
+        url = reverse('admin:scoreboard_member_changelist')
+        response = self.client.post(url, {
+            'action': 'delete_selected',
+            '_selected_action': [self.members[1].pk, self.members[2].pk],
+            'post': 'yes',
+        })
+        self.assertRedirects(response, url)
+        self.assertFalse(Member.objects.filter(pk__in=[self.members[1].pk, self.members[2].pk]).exists())
+        self.assertStandingsMatchReplay()
+
+
+class StandingsTests(LeagueTestCase):
+
+    def test_snapshots_match_replay(self):
+        self.assertTrue(StandingsSnapshot.objects.filter(league=self.league).exists())
+        self.assertStandingsMatchReplay()
+
+    def test_dates_between_games(self):
+        dates = self.game_dates()
+        self.assertStandingsMatchReplay([dates[0] - datetime.timedelta(days=1)] + [d + datetime.timedelta(days=1) for d in dates])
+
+    def test_backdated_games(self):
+        self.add_games(5, self.start + datetime.timedelta(days=1), seed=2)
+        self.assertStandingsMatchReplay()
+
+    def test_edited_and_deleted_entries(self):
+        entry = ScoreEntry.objects.filter(league=self.league).order_by('date')[5]
+        score = entry.scores.exclude(score=0).first()
+        score.score = 1000
+        score.save()
+        entries_changed(self.league, entry.date)
+        self.assertStandingsMatchReplay()
+
+        self.client.force_login(self.admin)
+        entry = ScoreEntry.objects.filter(league=self.league).order_by('date')[10]
+        self.client.post(reverse('admin:scoreboard_scoreentry_delete', args=[entry.pk]), {'post': 'yes'})
+        self.assertFalse(ScoreEntry.objects.filter(pk=entry.pk).exists())
+        self.assertStandingsMatchReplay()
+        self.assertHeadToHeadMatchesRebuild()
+
+
+
+class DataVersionTests(LeagueTestCase):
+
+    def data_version(self):
+        return League.objects.values_list('data_version', flat=True).get(pk=self.league.pk)
+
+    def test_member_delete_bumps_once(self):
+        version = self.data_version()
+        self.client.force_login(self.admin)
+        self.client.post(reverse('member_delete', args=[self.members[0].pk]))
+        self.assertEqual(self.data_version(), version + 1)
+
+    def test_admin_entry_edit_bumps_once(self):
+        entry = ScoreEntry.objects.filter(league=self.league).order_by('date')[3]
+        scores = list(entry.scores.exclude(score=0))
+        data = {
+            'league': self.league.pk, 'date': str(entry.date), 'created_by': self.admin.pk,
+            'scores-TOTAL_FORMS': len(scores), 'scores-INITIAL_FORMS': len(scores),
+            'scores-MIN_NUM_FORMS': 0, 'scores-MAX_NUM_FORMS': 1000,
+        }
+        for i, score in enumerate(scores):
+            data.update({f'scores-{i}-id': score.pk, f'scores-{i}-entry': entry.pk, f'scores-{i}-member': score.member_id, f'scores-{i}-score': score.score + i})
+        version = self.data_version()
+        self.client.force_login(self.admin)
+        response = self.client.post(reverse('admin:scoreboard_scoreentry_change', args=[entry.pk]), data)
+        self.assertRedirects(response, reverse('admin:scoreboard_scoreentry_changelist'))
+        self.assertEqual(self.data_version(), version + 1)
+        self.assertStandingsMatchReplay()
+
+
+class ScoreLeagueTests(LeagueTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.other = League.objects.create(slug='other', name='Other')
+        self.outsider = Member.objects.create(league=self.other, name="Outsider")
+
+    def test_scores_reject_members_of_other_leagues(self):
+        entry = ScoreEntry.objects.filter(league=self.league).first()
+        with self.assertRaises(ValidationError) as raised:
+            Score(league=self.league, entry=entry, member=self.outsider, score=10).full_clean()
+        self.assertIn('member', raised.exception.message_dict)
+
+        self.client.force_login(self.admin)
+        response = self.client.post(reverse('admin:scoreboard_score_add'), {'entry': entry.pk, 'member': self.outsider.pk, 'score': 10})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Score.objects.filter(member=self.outsider).exists())
+
+    def test_recent_members_stay_in_the_league(self):
+        entry = ScoreEntry.objects.filter(league=self.league).order_by('-date').first()
+        Score.objects.create(league=self.league, entry=entry, member=self.outsider, score=10)
+        self.assertNotIn(self.outsider, recent_members(self.league))
+
+    def test_admin_move_to_later_game_resyncs_from_the_old_one(self):
+        entries = list(ScoreEntry.objects.filter(league=self.league).order_by('date'))
+        score = entries[0].scores.exclude(score=0).first()
+        target = ScoreEntry.objects.create(league=self.league, date=entries[-1].date + datetime.timedelta(days=1), created_by=self.admin)
+        self.client.force_login(self.admin)
+        response = self.client.post(
+            reverse('admin:scoreboard_score_change', args=[score.pk]),
+            {'entry': target.pk, 'member': score.member_id, 'score': score.score},
+        )
+        self.assertRedirects(response, reverse('admin:scoreboard_score_changelist'))
+        self.assertStandingsMatchReplay()
+        self.assertHeadToHeadMatchesRebuild()
+
+
+class LeagueAccessTests(LeagueTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.other = League.objects.create(slug='other', name='Other')
+        self.outsider = Member.objects.create(league=self.other, name="Outsider")
+        self.viewer = User.objects.create_user('viewer', password='pw')
+        self.league.users.add(self.viewer)
+
+    def test_other_leagues_are_not_found(self):
+        self.client.force_login(self.viewer)
+        self.assertEqual(self.client.get(reverse('dashboard'), {'league': 'other'}).status_code, 404)
+        self.assertEqual(self.client.get(reverse('api_head_to_head'), {'league': 'other'}).status_code, 404)
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['current_league'], self.league)
+        self.assertEqual(list(response.context['leagues']), [self.league])
+
+    def test_pks_of_other_leagues_are_not_found(self):
+        entry = ScoreEntry.objects.create(league=self.other, date=self.start, created_by=self.admin)
+        self.client.force_login(self.admin)
+        self.client.get(reverse('dashboard'), {'league': 'default'})
+        self.assertEqual(self.client.get(reverse('member_edit', args=[self.outsider.pk])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('score_entry_detail', args=[entry.pk])).status_code, 404)
+
+    def test_users_without_a_league_are_refused(self):
+        self.client.force_login(User.objects.create_user('nobody', password='pw'))
+        self.assertEqual(self.client.get(reverse('dashboard')).status_code, 403)
+
+    def test_etags_differ_per_league(self):
+        self.other.users.add(self.viewer)
+        self.client.force_login(self.viewer)
+        responses = {slug: self.client.get(reverse('dashboard'), {'league': slug}) for slug in ('default', 'other')}
+        self.assertNotEqual(responses['default']['ETag'], responses['other']['ETag'])
+        self.assertContains(responses['default'], "Member 0")
+        self.assertNotContains(responses['other'], "Member 0")
+
+        image_etags = {
+            slug: self.client.get(reverse('overall_scoreboard_download'), {'league': slug})['ETag']
+            for slug in ('default', 'other')
+        }
+        self.assertNotEqual(image_etags['default'], image_etags['other'])
+
+
+@override_settings(AUTH_USER_CACHE_SECONDS=300)
+class CachedUserTests(LeagueTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.viewer = User.objects.create_user('viewer', password='pw')
+        self.league.users.add(self.viewer)
+        self.client.force_login(self.viewer)
+        self.assertEqual(self.client.get(reverse('dashboard')).status_code, 200)
+
+    def assertLoggedOut(self):
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response['Location'].startswith(reverse('login')))
+
+    def test_user_comes_from_the_cache(self):
+        self.assertIsNotNone(cache.get(user_cache_key(self.viewer.pk)))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(reverse('dashboard')).status_code, 200)
+        self.assertFalse([q for q in queries.captured_queries if 'FROM "auth_user"' in q['sql']])
+
+    def test_password_change_logs_out(self):
+        self.viewer.set_password('new')
+        self.viewer.save()
+        self.assertLoggedOut()
+
+    def test_deactivation_logs_out(self):
+        self.viewer.is_active = False
+        self.viewer.save()
+        self.assertLoggedOut()
+
+    def test_cached_user_must_match_the_session(self):
+        # The cached copy has a newer password than the one this session logged in with
+        changed = User.objects.get(pk=self.viewer.pk)
+        changed.set_password('new')
+        User.objects.filter(pk=changed.pk).update(password=changed.password)
+        cache.set(user_cache_key(changed.pk), changed)
+        self.assertLoggedOut()
+
+class HeadToHeadTests(LeagueTestCase):
+
+    def test_incremental_matches_rebuild(self):
+        self.assertTrue(HeadToHead.objects.filter(league=self.league).exists())
+        self.assertHeadToHeadMatchesRebuild()
+
+    def test_later_batches_match_rebuild(self):
+        # Same dates as the existing games, and through the API
+        self.add_games(10, self.start, seed=1)
+        self.client.force_login(self.admin)
+        response = self.client.post(reverse('api_score_entry_batch'), {"games": [
+            {"date": str(self.start), "scores": [{"member_id": m.id, "score": 10 * i - 15} for i, m in enumerate(self.members[:5])]},
+        ]}, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertHeadToHeadMatchesRebuild()
+
+
+class ConditionalGetTests(LeagueTestCase):
+
+    def test_dashboard_304_until_data_changes(self):
+        viewer = User.objects.create_user('viewer', password='pw')
+        self.league.users.add(viewer)
+        self.client.force_login(viewer)
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        response = self.client.get(reverse('dashboard'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.add_games(1, timezone.localdate(), seed=4)
+        response = self.client.get(reverse('dashboard'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class BatchValidationTests(LeagueTestCase):
+
+    def test_every_problem_is_reported(self):
+        alice, bob, carol, dave = self.members[:4]
+        with self.assertRaises(ValidationError) as raised:
+            validate_games(self.league, [
+                {"date": "2025-01-10", "scores": [(alice, 10), (bob, 5), (carol, 1), (dave.name, 2)]},
+                {"date": "2025-13-01", "scores": [(alice, 10), (bob, 5), (carol, 1), (dave, 2)]},
+                {"date": "2025-01-11", "scores": [(alice, 10), (bob, 5), (carol, 1)]},
+                {"date": "2025-01-12", "scores": [(alice, 10), (alice.id, 5), ("Nobody", 1), (dave, "x")]},
+            ])
+        errors = raised.exception.messages
+        self.assertEqual(len(errors), 3)
+        self.assertIn("invalid date '2025-13-01'", errors[0])
+        self.assertIn("must have scores for 4-6 members", errors[1])
+        self.assertIn("listed twice", errors[2])
+        self.assertIn("unknown member 'Nobody'", errors[2])
+        self.assertIn("invalid score 'x'", errors[2])
+
+    def test_csv_parsing(self):
+        games = parse_games_csv("game,date,member,score\n1,2025-01-10,A,1\n1,2025-01-10,B,2\n2,2025-01-11,A,3\n")
+        self.assertEqual([g['label'] for g in games], ['1', '2'])
+        self.assertEqual(games[0]['scores'], [('A', '1'), ('B', '2')])
+        with self.assertRaises(ValidationError):
+            parse_games_csv("date,member,score\n2025-01-10,A,1\n")
+        with self.assertRaises(ValidationError):
+            parse_games_csv("game,date,member,score\n1,2025-01-10,A,1\n1,2025-01-11,B,2\n")
+
+    def test_invalid_batch_writes_nothing(self):
+        count = ScoreEntry.objects.count()
+        self.client.force_login(self.admin)
+        csv_text = "game,date,member,score\n" + "".join(f"1,2025-01-10,{m.name},{i + 1}\n" for i, m in enumerate(self.members[:4]))
+        csv_text += "2,2025-01-11,Member 0,5\n"
+        response = self.client.post(reverse('score_entry_batch'), {'csv_text': csv_text})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ScoreEntry.objects.count(), count)
+
+        response = self.client.post(reverse('api_score_entry_batch'), {"games": [{"date": "nope", "scores": []}]}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.json()['errors']), 1)
+        self.assertEqual(ScoreEntry.objects.count(), count)
+
+
+
+class ImageOptionsTests(LeagueTestCase):
+
+    def test_bad_options_are_400_never_304(self):
+        self.client.force_login(self.admin)
+        for url in (reverse('overall_scoreboard_download'), reverse('api_standings_image')):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH='*')
+            self.assertEqual(response.status_code, 304, url)
+            for params in ({'size': 'huge'}, {'format': 'gif'}, {'as_of': '2025-02-30'}, {'as_of': 'yesterday'}):
+                response = self.client.get(url, params, HTTP_IF_NONE_MATCH='*')
+                self.assertEqual(response.status_code, 400, (url, params))
+                self.assertNotIn('ETag', response)
+
+
+class MemberSearchTests(LeagueTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for name in ("alice", "Alfred", "ALBERT", "Bob Al"):
+            Member.objects.create(league=self.league, name=name)
+        other = League.objects.create(slug='other', name='Other')
+        Member.objects.create(league=other, name="Alma")
+
+    def search(self, q):
+        response = self.client.get(reverse('api_member_search'), {'q': q})
+        self.assertEqual(response.status_code, 200)
+        return [m['name'] for m in response.json()['members']]
+
+    def test_case_insensitive_prefix_in_the_league(self):
+        self.client.force_login(self.admin)
+        self.assertEqual(self.search("al"), ["ALBERT", "Alfred", "alice"])
+        self.assertEqual(self.search("ALI"), ["alice"])
+        self.assertEqual(self.search("al%"), [])
+        self.assertEqual(self.search("bob a"), ["Bob Al"])
+
+    def test_without_query_lists_recent_players(self):
+        self.client.force_login(self.admin)
+        names = [m['name'] for m in self.client.get(reverse('api_member_search')).json()['members']]
+        self.assertEqual(sorted(names), sorted(m.name for m in self.members))
+
+    @skipUnless(connection.vendor == 'sqlite', "SQLite index")
+    def test_sqlite_uses_the_nocase_index(self):
+        plan = search_members(self.league, "al").values('id', 'name')[:20].explain()
+        self.assertIn('scoreboard_member_name_nocase', plan)
+
+
+@override_settings(REQUEST_PROFILING=True)
+class RequestProfilingTests(LeagueTestCase):
+
+    def test_only_staff_requests_are_profiled(self):
+        viewer = User.objects.create_user('viewer', password='pw')
+        self.league.users.add(viewer)
+        self.client.force_login(viewer)
+        response = self.client.get(reverse('dashboard'), {'profile': 'sample'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Profile-Url', response)
+        self.assertFalse(RequestProfile.objects.exists())
+
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('dashboard'), {'profile': 'cprofile'})
+        self.assertIn('X-Profile-Url', response)
+        profile = RequestProfile.objects.get()
+        self.assertEqual((profile.user, profile.mode, profile.status_code), (self.admin, 'cprofile', 200))
+
+    @override_settings(REQUEST_PROFILE_KEEP=3)
+    def test_only_the_newest_profiles_are_kept(self):
+        self.client.force_login(self.admin)
+        profiled = [
+            resolve(urlsplit(self.client.get(reverse('dashboard'), HTTP_X_PROFILE='1')['X-Profile-Url']).path).kwargs['object_id']
+            for _ in range(5)
+        ]
+        kept = RequestProfile.objects.order_by('created_at', 'pk').values_list('pk', flat=True)
+        self.assertEqual([str(pk) for pk in kept], profiled[-3:])
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class PrimaryPinningTests(SimpleTestCase):
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.token = use_primary.set(False)
+
+    def tearDown(self):
+        use_primary.reset(self.token)
+
+    def test_reads_go_to_replicas_until_a_write(self):
+        self.assertEqual(self.router.db_for_read(Member), 'replica1')
+        self.assertEqual(self.router.db_for_write(Member), 'default')
+        self.assertEqual(self.router.db_for_read(Member), 'default')
+
+    def test_middleware_pins_after_writes(self):
+        seen = []
+
+        def view(request):
+            seen.append(use_primary.get())
+            return HttpResponse()
+
+        middleware = PrimaryPinningMiddleware(view)
+        factory = RequestFactory()
+
+        response = middleware(factory.get('/'))
+        self.assertNotIn(PRIMARY_PIN_COOKIE, response.cookies)
+        response = middleware(factory.post('/'))
+        self.assertIn(PRIMARY_PIN_COOKIE, response.cookies)
+
+        request = factory.get('/')
+        request.COOKIES[PRIMARY_PIN_COOKIE] = '1'
+        middleware(request)
+        self.assertEqual(seen, [False, True, True])
+        self.assertFalse(use_primary.get())
+
+
+class SeasonTests(LeagueTestCase):
+
+    def close(self, name, end_date):
+        season = Season.objects.create(league=self.league, name=name, start_date=self.start, end_date=end_date)
+        return close_season(season)
+
+    def test_close_season_keeps_standings(self):
+        dates = self.game_dates()
+        before = {date: dict(standings_as_of(self.league, date)) for date in [None] + dates}
+        head_to_head = self.head_to_head()
+
+        season = self.close("S1", dates[14])
+        self.assertEqual(season.entry_count, 15)
+        self.assertFalse(Score.objects.filter(entry__date__lte=dates[14], league=self.league).exists())
+        self.assertEqual({date: dict(standings_as_of(self.league, date)) for date in before}, before)
+        self.assertStandingsMatchReplay()
+        self.assertHeadToHeadMatchesRebuild()
+        self.assertEqual(self.head_to_head(), head_to_head)
+
+    def test_games_after_closed_seasons(self):
+        dates = self.game_dates()
+        self.close("S1", dates[9])
+        self.add_games(5, dates[20] + datetime.timedelta(days=1), seed=3)
+        self.close("S2", dates[19])
+        self.assertStandingsMatchReplay()
+        self.assertHeadToHeadMatchesRebuild()
+
+    def test_member_delete_after_closed_seasons(self):
+        dates = self.game_dates()
+        self.close("S1", dates[9])
+        self.close("S2", dates[19])
+        self.client.force_login(self.admin)
+        self.client.post(reverse('member_delete', args=[self.members[0].pk]))
+        self.assertStandingsMatchReplay()
+        self.assertHeadToHeadMatchesRebuild()
+
+    def test_closed_season_rejects_games(self):
+        dates = self.game_dates()
+        self.close("S1", dates[9])
+        with self.assertRaises(ValidationError):
+            validate_games(self.league, [{"date": dates[9], "scores": [(m, 10) for m in self.members[:4]]}])
+
+
+class LoadTestStatsTests(SimpleTestCase):
+
+    def test_rate_counts_the_steady_state_only(self):
+        stats = Stats(window=(10.0, 20.0))
+        # Ramp-up, steady state (one of them dropped: no latency) and shutdown
+        for started in (5.0, 10.0, 15.0, 19.9, 20.0, 25.0):
+            stats.count('dashboard', started)
+        stats.latencies['dashboard'] += [0.01] * 5
+        stats.errors['dashboard'] += 1
+        [row] = stats.report()
+        self.assertEqual(row['requests'], 6)
+        self.assertAlmostEqual(row['rps'], 0.3)
@@ -3,7 +3,9 @@
 # ============================================
 
 from django.urls import path
-from . import views
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+
+from . import api, views
 
 urlpatterns = [
     # Auth
@@ -25,8 +27,17 @@ urlpatterns = [
     # Score Entries
     path('scores/', views.score_entry_list_view, name='score_entry_list'),
     path('scores/create/', views.score_entry_create_view, name='score_entry_create'),
+    path('scores/batch/', views.score_entry_batch_view, name='score_entry_batch'),
     path('scores/<int:pk>/', views.score_entry_detail_view, name='score_entry_detail'),
     path('scores/<int:pk>/download/', views.generate_scoreboard_image, name='generate_scoreboard'),
     path("scoreboard/overall/download/", views.generate_overall_scoreboard_image, name="overall_scoreboard_download"),
 
+    # API
+    path('api/token/', TokenObtainPairView.as_view(), name='api_token'),
+    path('api/token/refresh/', TokenRefreshView.as_view(), name='api_token_refresh'),
+    path('api/members/search/', api.member_search_api, name='api_member_search'),
+    path('api/head-to-head/', api.head_to_head_api, name='api_head_to_head'),
+    path('api/standings/image/', api.standings_image_api, name='api_standings_image'),
+    path('api/scores/batch/', api.score_entry_batch_api, name='api_score_entry_batch'),
+
 ]
@@ -6,16 +6,20 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, HttpResponseBadRequest
 from django.contrib.auth.models import User
-from django.views.decorators.http import require_http_methods
-from PIL import Image, ImageDraw, ImageFont
-import io
-from .models import Member, ScoreEntry, Score
-from .forms import UserRegistrationForm, MemberForm, ScoreEntryForm
-import datetime
-from django.db.models import Sum, Count, Q
-from django.db.models.functions import Coalesce
+from django.core.exceptions import ValidationError
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from .models import Member, ScoreEntry
+from .entries import create_entries, parse_games_csv, recent_members, validate_games
+from .forms import UserRegistrationForm, MemberForm, ScoreEntryForm, BatchScoreEntryForm
+from .cache import deferred_data_version, league_etag, league_last_modified, overall_image_etag
+from .leagues import get_current_league
+from .stats import entries_changed, head_to_head_matrix, members_first_games, standings_as_of, win_rate
+import bisect
+from django.utils.dateparse import parse_date
+from django.utils.functional import SimpleLazyObject
 
 def is_admin(user):
     return user.is_staff
@@ -57,6 +61,7 @@ def register_admin_view(request):
             user.set_password(form.cleaned_data['password'])
             user.is_staff = True
             user.save()
+            get_current_league(request).users.add(user)
             messages.success(request, f'Admin {user.username} registered successfully!')
             return redirect('dashboard')
     else:
@@ -74,6 +79,7 @@ def register_user_view(request):
             user.set_password(form.cleaned_data['password'])
             user.is_staff = False
             user.save()
+            get_current_league(request).users.add(user)
             messages.success(request, f'User {user.username} registered successfully!')
             return redirect('dashboard')
     else:
@@ -85,96 +91,82 @@ def register_user_view(request):
 # Dashboard
 # ============================================
 
-@login_required
-def dashboard_view(request):
-    from django.db.models import Sum, Q
-    from collections import defaultdict
-
-    score_entries = ScoreEntry.objects.prefetch_related('scores__member')
-
-    members = Member.objects.all()
-
-    # Initialize stats
-    rank_points = defaultdict(int)
-    max_points = defaultdict(int)
-    total_games = defaultdict(int)
-
-    for entry in score_entries:
-        game_scores = list(entry.scores.all())
-
-        # Ignore empty game
-        if not game_scores:
-            continue
-
-        # Sort highest → lowest
-        sorted_scores = sorted(game_scores, key=lambda s: s.score, reverse=True)
-
-        total_members_in_game = len(sorted_scores)
-
-        # Assign rank points
-        for position, score_obj in enumerate(sorted_scores, start=1):
-            member_id = score_obj.member_id
-
-            # Skip non-attending members
-            if score_obj.score == 0:
-                continue
-
-            # Rank points (higher rank = more points)
-            points = total_members_in_game - position + 1
-
-            rank_points[member_id] += points
-            max_points[member_id] += total_members_in_game
-            total_games[member_id] += 1
+def _parse_as_of(request):
+    """Optional ?as_of=YYYY-MM-DD parameter; None when absent or invalid."""
+    try:
+        return parse_date(request.GET.get('as_of') or '')
+    except ValueError:
+        return None
 
-    # Prepare final annotated member list
+def _members_score(members, standings):
+    """Members annotated with total score, games and win rate, best first."""
     members_list = []
     for m in members:
-        m.total_score = m.scores.aggregate(total=Sum('score'))['total'] or 0
-        m.total_games = total_games.get(m.id, 0)
-
-        rp = rank_points.get(m.id, 0)
-        mp = max_points.get(m.id, 0)
-
-        if mp == 0:
-            m.win_rate = 0
-        else:
-            m.win_rate = (rp / mp) * 100
-
+        stats = standings[m.id]
+        m.total_score = stats['total_score']
+        m.total_games = stats['games']
+        m.win_rate = win_rate(stats)
         members_list.append(m)
 
     # Sort by total score
-    members_score = sorted(
+    return sorted(
         members_list,
         key=lambda m: (-m.total_score, -m.win_rate, m.name)
     )
-    achievements = calculate_member_achievements(score_entries, members)
+
+def _achievements(members, standings):
     achievements_list = []
     for m in members:
-        ach = achievements[m.id]
+        stats = standings[m.id]
         achievements_list.append({
             "name": m.name,
-            "first": ach["first"],
-            "second": ach["second"],
-            "third": ach["third"],
-            "fourth": ach["fourth"],
-            "fifth": ach["fifth"],
-            "lost": ach["lost"],
-            "total_score": m.scores.aggregate(total=Sum('score'))['total'] or 0,
-            "win_rate": m.win_rate,
+            "first": stats["first"],
+            "second": stats["second"],
+            "third": stats["third"],
+            "fourth": stats["fourth"],
+            "fifth": stats["fifth"],
+            "lost": stats["lost"],
+            "total_score": stats["total_score"],
+            "win_rate": win_rate(stats),
         })
 
     # Sort by best performance
-    achievements_list = sorted(
+    return sorted(
         achievements_list,
         key=lambda x: (-x["total_score"], -x["win_rate"], x["name"])
     )
 
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=league_etag, last_modified_func=league_last_modified)
+def dashboard_view(request):
+    league = get_current_league(request)
+    as_of = _parse_as_of(request)
+
+    # Sections are computed lazily: when their cached fragment (keyed by the
+    # league's data version) is still valid, nothing below hits the database.
+    standings = SimpleLazyObject(lambda: standings_as_of(league, as_of))
+    members = Member.objects.filter(league=league)
+
+    score_entries = ScoreEntry.objects.filter(league=league).select_related('created_by')
+    if as_of:
+        score_entries = score_entries.filter(date__lte=as_of)
+
+    # History slider: one stop per game day, positioned at the requested date
+    history_dates = [d.isoformat() for d in ScoreEntry.objects.filter(league=league).dates('date', 'day')]
+    history_index = len(history_dates) - 1
+    if as_of:
+        history_index = max(bisect.bisect_right(history_dates, as_of.isoformat()) - 1, 0)
 
     return render(request, "scoreboard/dashboard.html", {
-        "members_score": members_score,
+        "members_score": SimpleLazyObject(lambda: _members_score(members, standings)),
         "score_entries": score_entries[:10],
-        "achievements": achievements_list,  
+        "achievements": SimpleLazyObject(lambda: _achievements(members, standings)),
+        "head_to_head": SimpleLazyObject(lambda: head_to_head_matrix(league, members)),
         "members": members,
+        "as_of": as_of,
+        "history_dates": history_dates,
+        "history_index": history_index,
         "is_admin": request.user.is_staff
     })
 
@@ -186,27 +178,29 @@ def dashboard_view(request):
 @login_required
 @user_passes_test(is_admin)
 def member_list_view(request):
-    members = Member.objects.all()
+    members = Member.objects.filter(league=get_current_league(request))
     return render(request, 'scoreboard/member_list.html', {'members': members})
 
 @login_required
 @user_passes_test(is_admin)
 def member_create_view(request):
+    member = Member(league=get_current_league(request))
+
     if request.method == 'POST':
-        form = MemberForm(request.POST)
+        form = MemberForm(request.POST, instance=member)
         if form.is_valid():
             form.save()
             messages.success(request, 'Member added successfully!')
             return redirect('member_list')
     else:
-        form = MemberForm()
+        form = MemberForm(instance=member)
     
     return render(request, 'scoreboard/member_form.html', {'form': form, 'action': 'Add'})
 
 @login_required
 @user_passes_test(is_admin)
 def member_edit_view(request, pk):
-    member = get_object_or_404(Member, pk=pk)
+    member = get_object_or_404(Member, pk=pk, league=get_current_league(request))
     
     if request.method == 'POST':
         form = MemberForm(request.POST, instance=member)
@@ -222,9 +216,15 @@ def member_edit_view(request, pk):
 @login_required
 @user_passes_test(is_admin)
 def member_delete_view(request, pk):
-    member = get_object_or_404(Member, pk=pk)
+    league = get_current_league(request)
+    member = get_object_or_404(Member, pk=pk, league=league)
     if request.method == 'POST':
-        member.delete()
+        since = members_first_games([member]).get(league.pk)
+        with deferred_data_version():
+            member.delete()
+            # Their scores are gone: every later position and snapshot may change
+            if since is not None:
+                entries_changed(league, since)
         messages.success(request, 'Member deleted successfully!')
         return redirect('member_list')
     
@@ -235,368 +235,131 @@ def member_delete_view(request, pk):
 # ============================================
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=league_etag, last_modified_func=league_last_modified)
 def score_entry_list_view(request):
-    entries = ScoreEntry.objects.all()
+    entries = ScoreEntry.objects.filter(league=get_current_league(request))
     return render(request, 'scoreboard/score_entry_list.html', {'entries': entries})
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=league_etag, last_modified_func=league_last_modified)
 def score_entry_detail_view(request, pk):
-    entry = get_object_or_404(ScoreEntry, pk=pk)
-    scores = entry.scores.all().order_by('-score')
+    entry = get_object_or_404(ScoreEntry, pk=pk, league=get_current_league(request))
+    scores = entry.results.all().order_by('-score')
     return render(request, 'scoreboard/score_entry_detail.html', {'entry': entry, 'scores': scores})
 
 @login_required
 @user_passes_test(is_admin)
 def score_entry_create_view(request):
-    members = Member.objects.all()
+    league = get_current_league(request)
+    rows = []
     
     if request.method == 'POST':
         form = ScoreEntryForm(request.POST, request.FILES)
         
+        # The form posts only the rows on screen (shortlist + searched
+        # members): parallel "member" id and "score" lists
+        posted = list(zip(request.POST.getlist('member'), request.POST.getlist('score')))
+        members = Member.objects.filter(league=league, pk__in=[pk for pk, _ in posted if pk.isdigit()]).in_bulk()
+        rows = [{'member': members[int(pk)], 'score': value} for pk, value in posted if pk.isdigit() and int(pk) in members]
+        
         if form.is_valid():
-            # Validate 4-6 members have scores
-            scored_members = []
-            for member in members:
-                score_value = request.POST.get(f'score_{member.id}')
-                if score_value and score_value.strip():
-                    scored_members.append((member, int(score_value)))
-            
-            if len(scored_members) < 4 or len(scored_members) > 6:
-                messages.error(request, 'You must provide scores for 4-6 members only!')
-                return render(request, 'scoreboard/score_entry_create.html', {
-                    'form': form,
-                    'members': members
-                })
-            
-            # Create entry
-            entry = form.save(commit=False)
-            entry.created_by = request.user
-            entry.save()
+            # Members with a score entered (4-6 required)
+            scored_members = [
+                (int(pk) if pk.isdigit() else pk, value)
+                for pk, value in posted if value.strip()
+            ]
             
-            # Add scores for selected members
-            scored_member_ids = []
-            for member, score_value in scored_members:
-                Score.objects.create(entry=entry, member=member, score=score_value)
-                scored_member_ids.append(member.id)
-            
-            # Add 0 score for remaining members
-            remaining_members = Member.objects.exclude(id__in=scored_member_ids)
-            for member in remaining_members:
-                Score.objects.create(entry=entry, member=member, score=0)
-            
-            messages.success(request, 'Scores added successfully!')
-            return redirect('score_entry_detail', pk=entry.id)
+            try:
+                games = validate_games(league, [{
+                    "date": form.cleaned_data['date'],
+                    "image": form.cleaned_data['image'],
+                    "scores": scored_members,
+                }], members=members.values())
+            except ValidationError as e:
+                for error in e.messages:
+                    messages.error(request, error)
+            else:
+                # Create entry; everyone else in the league gets a 0 score
+                entry, = create_entries(league, request.user, games)
+                
+                messages.success(request, 'Scores added successfully!')
+                return redirect('score_entry_detail', pk=entry.id)
     else:
         form = ScoreEntryForm()
     
+    shown = {row['member'].id for row in rows}
+    rows += [{'member': m, 'score': ''} for m in recent_members(league) if m.id not in shown]
     return render(request, 'scoreboard/score_entry_create.html', {
         'form': form,
-        'members': members
+        'rows': rows,
     })
 
+@login_required
+@user_passes_test(is_admin)
+def score_entry_batch_view(request):
+    league = get_current_league(request)
+
+    if request.method == 'POST':
+        form = BatchScoreEntryForm(request.POST, request.FILES)
+
+        if form.is_valid():
+            try:
+                games = validate_games(league, parse_games_csv(form.cleaned_data['csv_text']))
+            except ValidationError as e:
+                for error in e.messages:
+                    messages.error(request, error)
+            else:
+                entries = create_entries(league, request.user, games)
+                messages.success(request, f'{len(entries)} games added successfully!')
+                return redirect('score_entry_list')
+    else:
+        form = BatchScoreEntryForm()
+
+    return render(request, 'scoreboard/score_entry_batch.html', {'form': form})
+
 # ============================================
 # Scoreboard Image Generation
 # ============================================
 
 @login_required
 def generate_scoreboard_image(request, pk):
-    entry = get_object_or_404(ScoreEntry, pk=pk)
-    scores = entry.scores.all().order_by('-score')[:8]
-    
-    # Image dimensions
-    width, height = 1000, 1400
-    bg_color = (26, 32, 44)  # Dark blue-gray
-    
-    # Create image
-    img = Image.new('RGB', (width, height), bg_color)
-    draw = ImageDraw.Draw(img)
-    
-    # Load fonts
-    try:
-        title_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 60)
-        date_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 32)
-        name_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 38)
-        score_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 42)
-    except:
-        title_font = date_font = name_font = score_font = ImageFont.load_default()
-    
-    y_pos = 40
-    
-    # Title
-    title = "🏆 SCOREBOARD 🏆"
-    title_bbox = draw.textbbox((0, 0), title, font=title_font)
-    title_width = title_bbox[2] - title_bbox[0]
-    draw.text(((width - title_width) / 2, y_pos), title, fill=(255, 215, 0), font=title_font)
-    y_pos += 90
-    
-    # Date
-    date_text = entry.date.strftime("%B %d, %Y")
-    date_bbox = draw.textbbox((0, 0), date_text, font=date_font)
-    date_width = date_bbox[2] - date_bbox[0]
-    draw.text(((width - date_width) / 2, y_pos), date_text, fill=(203, 213, 225), font=date_font)
-    y_pos += 60
-    
-    # Uploaded image
-    if entry.image:
-        try:
-            uploaded_img = Image.open(entry.image.path)
-            # Resize to fit
-            max_img_width, max_img_height = 900, 350
-            uploaded_img.thumbnail((max_img_width, max_img_height), Image.Resampling.LANCZOS)
-            
-            # Center and paste
-            img_x = (width - uploaded_img.width) // 2
-            img.paste(uploaded_img, (img_x, y_pos))
-            y_pos += uploaded_img.height + 40
-        except Exception as e:
-            print(f"Error loading image: {e}")
-            y_pos += 20
-    
-    # Draw separator
-    draw.rectangle([(100, y_pos), (900, y_pos + 3)], fill=(100, 116, 139))
-    y_pos += 30
-    
-    # Rank colors
-    rank_colors = [
-        (255, 215, 0),   # 1st - Gold
-        (192, 192, 192), # 2nd - Silver
-        (205, 127, 50),  # 3rd - Bronze
-    ]
-    
-    # Draw scores
-    for i, score in enumerate(scores):
-        # Determine color
-        if i < 3:
-            color = rank_colors[i]
-        else:
-            color = (148, 163, 184)  # Gray for others
-        
-        # Background box
-        box_height = 85
-        box_y = y_pos + (i * (box_height + 10))
-        
-        # Draw rounded rectangle effect
-        draw.rectangle([(80, box_y), (920, box_y + box_height)], 
-                      fill=(45, 55, 72), outline=color, width=3)
-        
-        # Rank badge
-        rank_text = f"#{i + 1}"
-        draw.ellipse([(100, box_y + 15), (160, box_y + 70)], fill=color)
-        rank_bbox = draw.textbbox((0, 0), rank_text, font=name_font)
-        rank_w = rank_bbox[2] - rank_bbox[0]
-        rank_h = rank_bbox[3] - rank_bbox[1]
-        draw.text((130 - rank_w/2, box_y + 42 - rank_h/2), rank_text, fill=(26, 32, 44), font=name_font)
-        
-        # Member name
-        draw.text((190, box_y + 22), score.member.name, fill=(255, 255, 255), font=name_font)
-        
-        # Score
-        score_text = str(score.score)
-        score_bbox = draw.textbbox((0, 0), score_text, font=score_font)
-        score_width = score_bbox[2] - score_bbox[0]
-        draw.text((880 - score_width, box_y + 20), score_text, fill=color, font=score_font)
-    
-    # Footer
-    footer_y = height - 50
-    footer_text = f"Generated by {entry.created_by.username}"
-    footer_bbox = draw.textbbox((0, 0), footer_text, font=date_font)
-    footer_width = footer_bbox[2] - footer_bbox[0]
-    draw.text(((width - footer_width) / 2, footer_y), footer_text, fill=(100, 116, 139), font=date_font)
-    
-    # Save to buffer
-    buffer = io.BytesIO()
-    img.save(buffer, format='PNG', quality=95)
-    buffer.seek(0)
-    
-    # Return as downloadable file
-    response = HttpResponse(buffer, content_type='image/png')
+    # Pillow is only loaded by the image downloads (and by `manage.py check`:
+    # the ImageField system check imports it)
+    from . import images
+
+    entry = get_object_or_404(ScoreEntry, pk=pk, league=get_current_league(request))
+    scores = entry.results.all().order_by('-score')[:8]
+
+    response = HttpResponse(images.render_entry_scoreboard(entry, scores), content_type='image/png')
     response['Content-Disposition'] = f'attachment; filename="scoreboard_{entry.date}.png"'
     return response
 
 
 @login_required
+@cache_control(private=True, no_cache=True)
 def generate_overall_scoreboard_image(request):
-    # Get members with total score (change 'score_set' if you have related_name="scores")
-    members = (
-        Member.objects.annotate(
-            total_score=Sum('scores__score')  # or 'scores__score' if you set related_name="scores"
-        )
-        .order_by('-total_score')[:8]
-    )
-
-    # Image setup
-    width, height = 1000, 1400
-    bg_color = (26, 32, 44)
-    img = Image.new("RGB", (width, height), bg_color)
-    draw = ImageDraw.Draw(img)
+    from . import images
 
-    # Fonts (bigger sizes)
+    # Standings as of ?as_of=YYYY-MM-DD (default: all games), in
+    # ?size=full|medium|small and ?format=png|webp|jpeg. Invalid options are
+    # rejected before the conditional GET handling can answer 304.
     try:
-        title_font = ImageFont.truetype(
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 90
-        )
-        name_font = ImageFont.truetype(
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 60
-        )
-        score_font = ImageFont.truetype(
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 70
-        )
-        date_font = ImageFont.truetype(
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 45
-        )
-    except Exception:
-        title_font = name_font = score_font = date_font = ImageFont.load_default()
-
-    y_pos = 40
-
-    # Rank colors defined HERE (important)
-    rank_colors = [
-        (255, 215, 0),    # 1st - Gold
-        (192, 192, 192),  # 2nd - Silver
-        (205, 127, 50),   # 3rd - Bronze
-    ]
-
-    # Title
-    title = "🏆 OVERALL SCOREBOARD 🏆"
-    title_bbox = draw.textbbox((0, 0), title, font=title_font)
-    title_w = title_bbox[2] - title_bbox[0]
-    draw.text(((width - title_w) / 2, y_pos), title, fill=(255, 215, 0), font=title_font)
-    y_pos += 100
-
-    # Date
-    today_str = datetime.date.today().strftime("%B %d, %Y")
-    date_bbox = draw.textbbox((0, 0), today_str, font=date_font)
-    date_w = date_bbox[2] - date_bbox[0]
-    draw.text(((width - date_w) / 2, y_pos), today_str, fill=(203, 213, 225), font=date_font)
-    y_pos += 60
-
-    # Separator
-    draw.rectangle([(100, y_pos), (900, y_pos + 4)], fill=(100, 116, 139))
-    y_pos += 40
-
-    # Row layout
-    row_height = 160
-
-    for i, m in enumerate(members):
-        total_score = m.total_score or 0
-
-        # Negative score -> red
-        score_color = (255, 60, 60) if total_score < 0 else (255, 255, 255)
-
-        # Outline color by rank
-        if i < 3:
-            outline_color = rank_colors[i]
-        else:
-            outline_color = (148, 163, 184)
-
-        box_y = y_pos + i * (row_height + 20)
-
-        # Row box
-        draw.rectangle(
-            [(80, box_y), (920, box_y + row_height)],
-            fill=(45, 55, 72),
-            outline=outline_color,
-            width=5,
-        )
-
-        # Rank text
-        rank_text = f"#{i + 1}"
-        rank_bbox = draw.textbbox((0, 0), rank_text, font=name_font)
-        draw.text(
-            (100, box_y + (row_height - (rank_bbox[3] - rank_bbox[1])) / 2),
-            rank_text,
-            fill=outline_color,
-            font=name_font,
-        )
-
-        # Member name
-        name_text = m.name
-        draw.text((300, box_y + 40), m.name, fill=(255,255,255), font=name_font)
-
-
-        # Score (right aligned)
-        score_text = str(total_score)
-        score_bbox = draw.textbbox((0, 0), score_text, font=score_font)
-        score_w = score_bbox[2] - score_bbox[0]
-        draw.text((850 - score_w, box_y + 30), score_text, fill=score_color, font=score_font)
-
-
-    # Footer
-    footer = "Overall Scoreboard (Auto-generated)"
-    footer_bbox = draw.textbbox((0, 0), footer, font=date_font)
-    footer_w = footer_bbox[2] - footer_bbox[0]
-    draw.text(
-        ((width - footer_w) / 2, height - 60),
-        footer,
-        fill=(100, 116, 139),
-        font=date_font,
-    )
-
-    # Save to buffer
-    buffer = io.BytesIO()
-    img.save(buffer, format="PNG", quality=95)
-    buffer.seek(0)
-
-    response = HttpResponse(buffer, content_type="image/png")
-    response["Content-Disposition"] = 'attachment; filename="overall_scoreboard.png"'
+        as_of, size, image_format = images.overall_image_options(request.GET)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    return _overall_scoreboard_download(request, as_of, size, image_format)
+
+@condition(etag_func=overall_image_etag, last_modified_func=league_last_modified)
+def _overall_scoreboard_download(request, as_of, size, image_format):
+    from . import images
+
+    league = get_current_league(request)
+    _, content_type, extension, _ = images.IMAGE_FORMATS[image_format]
+    response = HttpResponse(images.overall_scoreboard_image(league, as_of, size, image_format), content_type=content_type)
+    filename = f"overall_scoreboard_{league.slug}_{as_of}" if as_of else f"overall_scoreboard_{league.slug}"
+    if size != 'full':
+        filename += f"_{size}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{extension}"'
     return response
-
-
-def calculate_member_achievements(score_entries, members):
-    """
-    Returns a dict: member_id → achievement stats
-    """
-    from collections import defaultdict
-    
-    # Initialise dictionary for each member
-    stats = {
-        m.id: {
-            "member": m,
-            "first": 0,
-            "second": 0,
-            "third": 0,
-            "fourth": 0,
-            "fifth": 0,
-            "lost": 0,
-        }
-        for m in members
-    }
-
-    for entry in score_entries:
-        game_scores = list(entry.scores.all())
-
-        if not game_scores:
-            continue  # skip empty game
-
-        # Sort by highest score → lowest
-        sorted_scores = sorted(game_scores, key=lambda s: s.score, reverse=True)
-
-        for index, score_obj in enumerate(sorted_scores):
-            member_id = score_obj.member_id
-            score = score_obj.score
-            if score_obj.score == 0:
-                continue
-
-            # LOST case (negative score)
-            if score < 0:
-                stats[member_id]["lost"] += 1
-                continue
-
-            # Ranking: based on sorted index
-            pos = index + 1
-
-            if pos == 1:
-                stats[member_id]["first"] += 1
-            elif pos == 2:
-                stats[member_id]["second"] += 1
-            elif pos == 3:
-                stats[member_id]["third"] += 1
-            elif pos == 4:
-                stats[member_id]["fourth"] += 1
-            elif pos == 5:
-                stats[member_id]["fifth"] += 1
-            else:
-                # No ranking for >5, but no "lost" unless negative
-                pass
-
-    return stats
@@ -0,0 +1,33 @@
+# ============================================
+# FILE: scoreboard/warmup.py
+# ============================================
+
+from pathlib import Path
+
+from django.template import engines
+from django.template.loader import get_template
+
+
+def preload_fonts():
+    from . import images
+
+    images.preload_fonts()
+
+
+def compile_templates():
+    """Parses every project template into the (cached) template loader."""
+    for directory in engines['django'].engine.dirs:
+        for path in Path(directory).rglob('*.html'):
+            get_template(path.relative_to(directory).as_posix())
+
+
+def warmup():
+    """
+    Pays the first-request costs at startup instead: Pillow and fonts, and
+    template compilation. Run from ScoreboardConfig.ready() when
+    SCOREBOARD_WARMUP is set. Database connections are left alone: Django
+    opens them per thread and closes them at the start of each request
+    unless CONN_MAX_AGE keeps them.
+    """
+    preload_fonts()
+    compile_templates()
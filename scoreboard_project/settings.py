@@ -22,10 +22,12 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'scoreboard.middleware.PrimaryPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'scoreboard.middleware.CachedAuthenticationMiddleware',
+    'scoreboard.middleware.RequestProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -44,6 +46,7 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'django.template.context_processors.media',
+                'scoreboard.context_processors.league',
             ],
         },
     },
@@ -58,6 +61,21 @@ DATABASES = {
     }
 }
 
+# Read replicas (optional): SCOREBOARD_DB_REPLICAS="name1,name2" adds aliases
+# replica1..N with the default settings and NAME swapped. Locally, point it at
+# a copy of db.sqlite3 (re-copy it to simulate replication); read-only views
+# then read from the copy while writers stay pinned to the primary.
+DATABASE_REPLICAS = []
+for number, name in enumerate(filter(None, os.environ.get('SCOREBOARD_DB_REPLICAS', '').split(',')), start=1):
+    alias = f'replica{number}'
+    DATABASES[alias] = {**DATABASES['default'], 'NAME': name.strip(), 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['scoreboard.routers.PrimaryReplicaRouter']
+
+# Seconds a client keeps reading from the primary after a write
+DATABASE_PRIMARY_PIN_SECONDS = 10
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -78,22 +96,81 @@ MEDIA_URL = '/media/'
 
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# Hashed file names (run collectstatic on deploy) let the web server send
+# static files with far-future expiry; .gz/.br variants are written alongside.
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "scoreboard.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+
 MEDIA_ROOT = BASE_DIR / "media"
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Template fragments are keyed by League.data_version, so a per-process
+# cache is safe; point these at a shared backend to share warm fragments.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('SCOREBOARD_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('SCOREBOARD_CACHE_LOCATION', 'scoreboard'),
+    }
+}
+
+# Caches local to each process: fine for fragments (see above), not for
+# anything that must be invalidated everywhere at once
+PER_PROCESS_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+SHARED_CACHE = CACHES['default']['BACKEND'] not in PER_PROCESS_CACHE_BACKENDS
+
+# Sessions: "cached_db" reads through the cache and only hits the database
+# on a miss; "signed_cookies" keeps the session in the client's cookie and
+# never touches the database. cached_db is only the default with a shared
+# cache: with a per-process one, a logout would not reach the other workers.
+SESSION_ENGINE = 'django.contrib.sessions.backends.' + os.environ.get(
+    'SCOREBOARD_SESSION_ENGINE', 'cached_db' if SHARED_CACHE else 'db'
+)
+
+# How long CachedAuthenticationMiddleware may serve request.user from the
+# cache (entries are dropped whenever the user is saved or deleted, which
+# only reaches every worker through a shared cache). 0 loads the user from
+# the database on every request, as AuthenticationMiddleware does.
+AUTH_USER_CACHE_SECONDS = int(os.environ.get('SCOREBOARD_AUTH_USER_CACHE_SECONDS', 300 if SHARED_CACHE else 0))
+
+# Warm each worker up when the app loads (fonts, templates) so the first
+# request does not pay for it. Leave off for management commands, and for
+# servers that fork after loading the app.
+SCOREBOARD_WARMUP = os.environ.get('SCOREBOARD_WARMUP', '').lower() in ('1', 'true', 'yes')
+
+# Staff can profile a single request with ?profile=sample|cprofile (or an
+# X-Profile header); results are kept in the admin under "Request profiles",
+# newest REQUEST_PROFILE_KEEP only. Set SCOREBOARD_PROFILING=0 to disable.
+REQUEST_PROFILING = os.environ.get('SCOREBOARD_PROFILING', '1').lower() in ('1', 'true', 'yes')
+REQUEST_PROFILE_KEEP = 50
+
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/dashboard/'
 
+# API tokens carry username/is_staff claims (see api.TokenObtainPairSerializer),
+# so JWT requests are authenticated without loading the user row.
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'rest_framework_simplejwt.authentication.JWTStatelessUserAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
     ),
+    # ?format= selects the image format of api/standings/image/, not a renderer
+    'URL_FORMAT_OVERRIDE': None,
 }
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=24),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
+    'TOKEN_OBTAIN_SERIALIZER': 'scoreboard.api.TokenObtainPairSerializer',
 }
 
 
@@ -0,0 +1,20 @@
+// History slider: jump to the standings after the selected game day
+(function () {
+    const slider = document.getElementById("historySlider");
+    if (!slider) {
+        return;
+    }
+
+    const dates = JSON.parse(document.getElementById("history-dates").textContent);
+    const label = document.getElementById("historyLabel");
+
+    function showLabel() {
+        label.textContent = dates[slider.value];
+    }
+
+    slider.addEventListener("input", showLabel);
+    slider.addEventListener("change", function () {
+        window.location.search = "?as_of=" + dates[slider.value];
+    });
+    showLabel();
+})();
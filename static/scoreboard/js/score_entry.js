@@ -0,0 +1,93 @@
+// Add scores: search members by name and add them as score rows, so only
+// the members on screen are submitted
+(function () {
+    const search = document.getElementById("memberSearch");
+    if (!search) {
+        return;
+    }
+
+    const results = document.getElementById("memberResults");
+    const rows = document.getElementById("memberRows");
+    const template = document.getElementById("memberRowTemplate");
+    let timer = null;
+    let pending = null;
+
+    function findRow(id) {
+        return rows.querySelector('[data-member-id="' + id + '"]');
+    }
+
+    function addRow(member) {
+        let row = findRow(member.id);
+        if (!row) {
+            const empty = document.getElementById("noRows");
+            if (empty) {
+                empty.remove();
+            }
+            row = template.content.firstElementChild.cloneNode(true);
+            row.dataset.memberId = member.id;
+            row.querySelector("label").textContent = member.name;
+            row.querySelector('input[name="member"]').value = member.id;
+            rows.prepend(row);
+        }
+        row.querySelector('input[name="score"]').focus();
+    }
+
+    function showResults(members) {
+        results.replaceChildren();
+        members.forEach(function (member) {
+            const button = document.createElement("button");
+            button.type = "button";
+            button.className = "btn";
+            button.textContent = (findRow(member.id) ? "✓ " : "+ ") + member.name;
+            button.addEventListener("click", function () {
+                addRow(member);
+                search.value = "";
+                results.replaceChildren();
+            });
+            results.appendChild(button);
+        });
+        if (!members.length) {
+            results.textContent = "No members found.";
+        }
+    }
+
+    function runSearch() {
+        const query = search.value.trim();
+        if (pending) {
+            pending.abort();
+        }
+        if (!query) {
+            results.replaceChildren();
+            return;
+        }
+        pending = new AbortController();
+        fetch(search.dataset.url + "?q=" + encodeURIComponent(query), {
+            headers: { "Accept": "application/json" },
+            credentials: "same-origin",
+            signal: pending.signal,
+        })
+            .then(function (response) {
+                return response.ok ? response.json() : { members: [] };
+            })
+            .then(function (data) {
+                showResults(data.members);
+            })
+            .catch(function () {});
+    }
+
+    search.addEventListener("input", function () {
+        clearTimeout(timer);
+        timer = setTimeout(runSearch, 200);
+    });
+
+    // Enter adds the first match instead of submitting the form
+    search.addEventListener("keydown", function (event) {
+        if (event.key === "Enter") {
+            event.preventDefault();
+            const first = results.querySelector("button");
+            if (first) {
+                first.click();
+            }
+        }
+    });
+})();